@@ -0,0 +1,144 @@
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+
+DEFAULT_PATH = os.path.join(os.environ.get("APP_DATA_DIR", "data"), "answer_cache.sqlite3")
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def scope_key(model: str, system_prompt: str, language: str) -> str:
+    """Answers are only reused for the same model, system prompt and language."""
+    return hashlib.sha1(f"{model}\0{system_prompt}\0{language}".encode("utf-8")).hexdigest()
+
+
+def normalize(query: str) -> str:
+    """Casefold, drop punctuation/symbols and collapse whitespace."""
+    kept = [
+        " " if unicodedata.category(ch)[0] in "PSZC" else ch
+        for ch in unicodedata.normalize("NFC", query).casefold()
+    ]
+    return " ".join("".join(kept).split())
+
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a: str, b: str) -> float:
+    """Jaccard similarity of character trigrams of two normalized queries.
+
+    Queries citing different numbers (e.g. IPC 420 vs IPC 302) never match.
+    """
+    if re.findall(r"\d+", a) != re.findall(r"\d+", b):
+        return 0.0
+    ta, tb = _trigrams(a), _trigrams(b)
+    return len(ta & tb) / len(ta | tb) if ta and tb else 0.0
+
+
+class AnswerCache:
+    """SQLite-backed answer cache with exact, normalized and near-duplicate lookup."""
+
+    def __init__(self, path: str = DEFAULT_PATH, ttl: float | None = None, max_entries: int | None = None,
+                 min_similarity: float | None = None):
+        self.path = path
+        self.ttl = ttl if ttl is not None else float(os.environ.get("ANSWER_CACHE_TTL", 7 * 24 * 3600))
+        self.max_entries = max_entries if max_entries is not None else int(os.environ.get("ANSWER_CACHE_MAX_ENTRIES", "5000"))
+        # 0 disables near-duplicate matching; only exact/normalized hits are served
+        self.min_similarity = min_similarity if min_similarity is not None else float(os.environ.get("ANSWER_CACHE_SIMILARITY", "0"))
+        self.counters = {"exact": 0, "normalized": 0, "similar": 0, "miss": 0}
+        self._lock = threading.Lock()
+        self._puts = 0
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            " scope TEXT NOT NULL, query TEXT NOT NULL, norm TEXT NOT NULL, answer TEXT NOT NULL,"
+            " created REAL NOT NULL, last_hit REAL NOT NULL, PRIMARY KEY (scope, query))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS answers_norm ON answers (scope, norm)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS answers_last_hit ON answers (last_hit)")
+        self._db.commit()
+
+    def get(self, scope: str, query: str) -> str | None:
+        query = query.strip()
+        norm = normalize(query)
+        now = time.time()
+        fresh_after = now - self.ttl
+        with self._lock:
+            row = self._db.execute(
+                "SELECT rowid, answer FROM answers WHERE scope = ? AND query = ? AND created > ?",
+                (scope, query, fresh_after),
+            ).fetchone()
+            tier = "exact"
+            if row is None:
+                row = self._db.execute(
+                    "SELECT rowid, answer FROM answers WHERE scope = ? AND norm = ? AND created > ? LIMIT 1",
+                    (scope, norm, fresh_after),
+                ).fetchone()
+                tier = "normalized"
+            if row is None and self.min_similarity > 0 and norm:
+                candidates = self._db.execute(
+                    "SELECT rowid, answer, norm FROM answers WHERE scope = ? AND created > ? ORDER BY last_hit DESC LIMIT 500",
+                    (scope, fresh_after),
+                ).fetchall()
+                best = max(candidates, key=lambda c: similarity(norm, c[2]), default=None)
+                if best is not None and similarity(norm, best[2]) >= self.min_similarity:
+                    row = best[:2]
+                    tier = "similar"
+            if row is None:
+                self.counters["miss"] += 1
+                return None
+            self.counters[tier] += 1
+            self._db.execute("UPDATE answers SET last_hit = ? WHERE rowid = ?", (now, row[0]))
+            self._db.commit()
+            return row[1]
+
+    def put(self, scope: str, query: str, answer: str) -> None:
+        query = query.strip()
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO answers (scope, query, norm, answer, created, last_hit) VALUES (?, ?, ?, ?, ?, ?)",
+                (scope, query, normalize(query), answer, now, now),
+            )
+            self._puts += 1
+            if self._puts % 50 == 1:
+                self._evict(now)
+            self._db.commit()
+
+    def _evict(self, now: float) -> None:
+        self._db.execute("DELETE FROM answers WHERE created <= ?", (now - self.ttl,))
+        self._db.execute(
+            "DELETE FROM answers WHERE rowid IN (SELECT rowid FROM answers ORDER BY last_hit DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM answers")
+            self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+            hits = sum(v for k, v in self.counters.items() if k != "miss")
+            return dict(self.counters, hits=hits, entries=entries)
+
+
+def get_cache(path: str | None = None) -> AnswerCache:
+    """Return the process-wide cache for ``path`` (shared by all sessions)."""
+    path = path or os.environ.get("ANSWER_CACHE_PATH", DEFAULT_PATH)
+    with _caches_lock:
+        if path not in _caches:
+            _caches[path] = AnswerCache(path)
+        return _caches[path]
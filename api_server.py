@@ -0,0 +1,269 @@
+"""Headless HTTP API for the legal assistant, served without the Streamlit runtime.
+
+Uses the same answer pipeline (:mod:`assistant`), translations and stores as
+the web app. Per-user conversation memory lives in a bounded in-process
+store; interaction history is the shared SQLite log. Model calls block, so
+they run on a thread pool while the event loop keeps serving other
+requests::
+
+    python api_server.py --port 8080
+
+Endpoints (``user`` identifies the caller; send ``Authorization: Bearer
+$API_TOKEN`` when ``API_TOKEN`` is set). ``user`` is trusted as given, so
+the API is meant for a frontend that authenticates its own users, and it
+does not listen beyond localhost without ``API_TOKEN``:
+
+- ``POST /v1/query`` ``{"user", "question", "language", "stream"}``: the
+  answer as JSON, or with ``"stream": true`` as NDJSON lines
+  ``{"delta": ...}`` followed by one ``{"done": true, ...}`` line
+- ``GET /v1/history?user=&limit=&offset=&q=``: the user's past questions and answers,
+  newest first, or the best full-text matches for ``q``
+- ``DELETE /v1/history?user=``: clear the history and conversation memory
+- ``GET /v1/export?user=&format=csv|pdf``: the history as a download
+- ``GET /health``: backend host status and scheduler queue metrics
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web
+
+import assistant
+import llm_client
+import router
+import scheduler
+from app_content import language_label, translations
+from conversation import ConversationMemory
+from interaction_store import InteractionLog
+
+
+class SessionStore:
+    """Conversation memory per user, evicted after ``ttl`` idle seconds or beyond ``max_sessions``."""
+
+    def __init__(self, max_sessions: int | None = None, ttl: float | None = None):
+        self.max_sessions = max_sessions or int(os.environ.get("API_MAX_SESSIONS", "10000"))
+        self.ttl = ttl if ttl is not None else float(os.environ.get("API_SESSION_TTL", "1800"))
+        self._sessions = OrderedDict()  # user -> (last used, ConversationMemory)
+        self._lock = threading.Lock()
+
+    def memory(self, user: str) -> ConversationMemory:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.pop(user, None)
+            memory = entry[1] if entry and now - entry[0] < self.ttl else ConversationMemory()
+            self._sessions[user] = (now, memory)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            while self._sessions:
+                oldest = next(iter(self._sessions.values()))
+                if now - oldest[0] < self.ttl:
+                    break
+                self._sessions.popitem(last=False)
+            return memory
+
+    def drop(self, user: str) -> None:
+        with self._lock:
+            self._sessions.pop(user, None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+def _error(status: int, message: str, **headers) -> web.Response:
+    return web.json_response({"error": message}, status=status, headers=headers)
+
+
+def _user(request: web.Request, body: dict | None = None) -> str:
+    user = (body or {}).get("user") or request.query.get("user") or ""
+    user = user.strip() if isinstance(user, str) else ""
+    if not user or len(user) > 128:
+        raise web.HTTPBadRequest(text=json.dumps({"error": "'user' is required"}), content_type="application/json")
+    return user
+
+
+@web.middleware
+async def auth_middleware(request: web.Request, handler):
+    token = os.environ.get("API_TOKEN")
+    if token and request.path != "/health" and request.headers.get("Authorization") != f"Bearer {token}":
+        return _error(401, "invalid or missing API token")
+    return await handler(request)
+
+
+async def _run(request: web.Request, fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(request.app["pool"], fn, *args)
+
+
+def _describe(e: Exception) -> tuple:
+    """``(message, retryable)`` for a failed answer; a busy queue is worth retrying shortly."""
+    if isinstance(e, scheduler.SchedulerBusy):
+        return str(e), True
+    if isinstance(e, llm_client.OllamaError):
+        return str(e), False
+    return assistant.NOT_AVAILABLE, False
+
+
+def _failure(e: Exception) -> web.Response:
+    message, retryable = _describe(e)
+    return _error(503, message, **({"Retry-After": "5"} if retryable else {}))
+
+
+async def query(request: web.Request) -> web.StreamResponse:
+    try:
+        body = await request.json()
+    except ValueError:
+        return _error(400, "expected a JSON body")
+    if not isinstance(body, dict):
+        return _error(400, "expected a JSON object")
+    for field in ("question", "language"):
+        if not isinstance(body.get(field) or "", str):
+            return _error(400, f"'{field}' must be a string")
+    user = _user(request, body)
+    question = (body.get("question") or "").strip()
+    language = language_label(body.get("language") or "English")
+    if language is None:
+        return _error(400, f"unsupported language {body.get('language')!r}")
+    no_response = translations[language]["no_response"]
+    if len(question) < 3:
+        return web.json_response({"answer": no_response, "source": None})
+
+    memory = request.app["sessions"].memory(user)
+    log = InteractionLog(user)
+    stats = {}
+    if not body.get("stream"):
+        try:
+            answer = await _run(request, assistant.answer, question, language, memory, None, stats)
+        except Exception as e:
+            return _failure(e)
+        answer = answer or no_response
+        await _run(request, log.append, question, answer)
+        return web.json_response({"answer": answer, "source": stats.get("source"), "timings": _timings(stats)})
+
+    # Streaming: the worker thread hands accumulated text to the event loop, which sends only the new part
+    loop = asyncio.get_running_loop()
+    updates = asyncio.Queue()
+
+    def on_token(text):
+        loop.call_soon_threadsafe(updates.put_nowait, text)
+
+    future = loop.run_in_executor(request.app["pool"], assistant.answer, question, language, memory, on_token, stats)
+    response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson"})
+    await response.prepare(request)
+    sent = 0
+    while True:
+        getter = asyncio.ensure_future(updates.get())
+        await asyncio.wait([getter, future], return_when=asyncio.FIRST_COMPLETED)
+        if not getter.done():
+            getter.cancel()
+            break
+        text = getter.result()
+        await response.write(json.dumps({"delta": text[sent:]}, ensure_ascii=False).encode("utf-8") + b"\n")
+        sent = len(text)
+    while not updates.empty():
+        text = updates.get_nowait()
+        await response.write(json.dumps({"delta": text[sent:]}, ensure_ascii=False).encode("utf-8") + b"\n")
+        sent = len(text)
+    final = {"done": True, "source": stats.get("source"), "timings": _timings(stats)}
+    try:
+        answer = future.result() or no_response
+    except Exception as e:
+        final["error"], final["retryable"] = _describe(e)
+        answer = no_response
+    if sent == 0:
+        # Answered from the FAQ or cache (or not at all): nothing was streamed yet
+        await response.write(json.dumps({"delta": answer}, ensure_ascii=False).encode("utf-8") + b"\n")
+    await _run(request, log.append, question, answer)
+    await response.write(json.dumps(dict(final, answer=answer), ensure_ascii=False).encode("utf-8") + b"\n")
+    await response.write_eof()
+    return response
+
+
+def _timings(stats: dict) -> dict:
+    return {k: round(v, 4) for k, v in stats.items() if isinstance(v, float)}
+
+
+async def history(request: web.Request) -> web.Response:
+    user = _user(request)
+    try:
+        limit = max(min(int(request.query.get("limit", "50")), 500), 1)
+        offset = max(int(request.query.get("offset", "0")), 0)
+    except ValueError:
+        return _error(400, "'limit' and 'offset' must be integers")
+    log = InteractionLog(user)
+    search = request.query.get("q", "").strip()
+    if search:
+        rows, more = await _run(request, log.search, search, offset, limit)
+    else:
+        rows = await _run(request, log.page, offset, limit)
+        more = offset + len(rows) < await _run(request, len, log)
+    return web.json_response({
+        "user": user,
+        "more": more,
+        "items": [{"id": i, "ts": ts, "user_query": q, "assistant_response": a} for i, ts, q, a in rows],
+    })
+
+
+async def clear_history(request: web.Request) -> web.Response:
+    user = _user(request)
+    await _run(request, InteractionLog(user).clear)
+    request.app["sessions"].drop(user)
+    return web.json_response({"user": user, "cleared": True})
+
+
+async def export(request: web.Request) -> web.Response:
+    user = _user(request)
+    log = InteractionLog(user)
+    if request.query.get("format", "csv") == "pdf":
+        from pdf_export import export_pdf
+        version = await _run(request, lambda: log.version)
+        data = await _run(request, export_pdf, (user, version), log.rows)
+        filename, content_type = "Chat_History.pdf", "application/pdf"
+    else:
+        data = await _run(request, log.to_csv)
+        filename, content_type = "interaction_history.csv", "text/csv"
+    return web.Response(body=data, content_type=content_type,
+                        headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+
+async def health(request: web.Request) -> web.Response:
+    hosts = [{"url": url, "model": model, "status": status, "outstanding": outstanding}
+             for url, model, status, outstanding in router.get_router().status()]
+    return web.json_response({
+        "available": router.get_router().available(),
+        "hosts": hosts,
+        "queue": scheduler.get_scheduler().metrics(),
+        "sessions": len(request.app["sessions"]),
+    })
+
+
+def create_app(workers: int | None = None) -> web.Application:
+    app = web.Application(middlewares=[auth_middleware], client_max_size=64 * 1024)
+    app["sessions"] = SessionStore()
+    app["pool"] = ThreadPoolExecutor(max_workers=workers or int(os.environ.get("API_WORKERS", "32")),
+                                     thread_name_prefix="api")
+    app.router.add_post("/v1/query", query)
+    app.router.add_get("/v1/history", history)
+    app.router.add_delete("/v1/history", clear_history)
+    app.router.add_get("/v1/export", export)
+    app.router.add_get("/health", health)
+
+    async def shutdown(app):
+        app["pool"].shutdown(wait=False)
+
+    app.on_cleanup.append(shutdown)
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the headless legal assistant HTTP API.")
+    parser.add_argument("--host", default=os.environ.get("API_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.environ.get("API_PORT", "8080")))
+    parser.add_argument("--workers", type=int, help="threads for blocking model and database calls")
+    args = parser.parse_args()
+    if not os.environ.get("API_TOKEN") and args.host not in ("127.0.0.1", "localhost", "::1"):
+        parser.error("set API_TOKEN to listen beyond localhost: any caller could read any user's history")
+    web.run_app(create_app(args.workers), host=args.host, port=args.port, access_log=None)
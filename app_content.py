@@ -0,0 +1,178 @@
+"""Static UI content shared by every session: translations, template names and CSS.
+
+Kept out of testapp.py so it is built once per process on import instead of
+on every Streamlit rerun.
+"""
+
+LANGUAGES = ["English", "Hindi - हिन्दी", "Telugu - తెలుగు", "Tamil - தமிழ்", "Malayalam - മലയാളം", "Kannada - ಕನ್ನಡ"]
+
+
+def language_label(value: str) -> str | None:
+    """The full label for ``value`` given as a label or a bare name ("Hindi"), or None."""
+    for language in LANGUAGES:
+        if value == language or value.lower() == language.split(" - ")[0].lower():
+            return language
+    return None
+
+
+# Language Translation Dictionary
+translations = {
+    "English": {
+        "ask_query": "Ask your query for legal assistance",
+        "thinking": "Thinking ✨...",
+        "no_response": "Sorry, I couldn't find a matching response for your query.",
+        "positive_feedback": "👍 Positive feedback",
+        "negative_feedback": "👎 Negative feedback",
+        "login_button": "Login",
+        "welcome": "Welcome",
+        "faq_button": "Show FAQs",
+        "download_button": "Download",
+        "interaction_history": "Show Interaction History",
+        "voice_query": "Voice Query 🎙️",
+        "view_history": "View History 📜",
+        "download_law": "Download Law 📁 ",
+        "info_section": "**Legal Laws Assistance:📄**\n- **Objective:** Developed a conversational chatbot to provide legal laws info and assistance.\n- **Features:**📜\n  - Allows users to ask their query of law.\n  - Includes Mutlilingual, Voice query, Legal templates support.\n  - Provides a response to user query. ✔\n  - Offers a user-friendly interface for asking legal queries."
+    },
+    "Hindi - हिन्दी": {
+        "ask_query": "कानूनी सहायता के लिए अपना प्रश्न पूछें",
+        "thinking": "सोच रहे हैं ✨...",
+        "no_response": "मुझे आपके प्रश्न का मिलान करने वाला उत्तर नहीं मिला।",
+        "positive_feedback": "👍 सकारात्मक प्रतिक्रिया",
+        "negative_feedback": "👎 नकारात्मक प्रतिक्रिया",
+        "login_button": "लॉगिन करें",
+        "welcome": "स्वागत है",
+        "faq_button": "सामान्य प्रश्न दिखाएँ",
+        "download_button": "चैट इतिहास डाउनलोड करें",
+        "interaction_history": "इंटरएक्शन इतिहास दिखाएँ",
+        "voice_query": "आवाज़ से पूछें 🎙️",
+        "view_history": "इतिहास देखें 📜",
+        "download_law": "कानून डाउनलोड करें 📁",
+         "info_section": """
+        **कानूनी क़ानून सलाहकार बॉट📄**
+        - **लक्ष्य:** कानूनी क़ानून जानकारी और सहायता प्रदान करने के लिए एक संवादात्मक चैटबॉट विकसित किया गया।
+        - **विशेषताएँ:**📜
+          -  उपयोगकर्ताओं को कानून से संबंधित प्रश्न पूछने की अनुमति देता है। 𓍝
+          -  उपयोगकर्ता के प्रश्न का उत्तर प्रदान करता है। ✔
+          -  उपयोगकर्ता के प्रश्न का विस्तृत विवरण, दंड, लाभ, और हानियाँ प्रदर्शित करता है। ✉︎
+          -  कानूनी प्रश्न पूछने के लिए एक उपयोगकर्ता-मित्र इंटरफेस प्रदान करता है। 🔗
+        """
+    },
+    "Telugu - తెలుగు": {
+        "ask_query": "న్యాయ సహాయం కోసం మీ ప్రశ్నను అడగండి",
+        "thinking": "ఆలోచిస్తున్నాను ✨...",
+        "no_response": "మీ ప్రశ్నకు సరిపడే సమాధానం కనుగొనలేకపోయాను.",
+        "positive_feedback": "👍 సానుకూల అభిప్రాయం",
+        "negative_feedback": "👎 ప్రతికూల అభిప్రాయం",
+        "login_button": "లాగిన్ చేయండి",
+        "welcome": "స్వాగతం",
+        "faq_button": "ఎఫ్ ఏ క్యూ లను చూపించండి",
+        "download_button": "చాట్ చరిత్రను డౌన్‌లోడ్ చేయండి",
+        "interaction_history": "మాట్లాడిన చరిత్ర చూపించు",
+        "voice_query": "వాయిస్ క్వెరీ 🎙️",
+        "view_history": "చరిత్ర చూడండి 📜",
+        "download_law": "డౌన్‌లోడ్ చేయండి 📁",
+        "info_section": """
+        **చట్టాల సలహా బాట్📄**
+        - **ఉద్దేశం:** చట్టాల సమాచారం మరియు సహాయం అందించడానికి ఒక సంభాషణ చాట్‌బాట్‌ను అభివృద్ధి చేయడం।
+        - **ప్రతి పౌరుడు చట్టాల గురించి అవగాహన కలిగి ఉండాలి.
+        - **సదుపాయాలు:**📜
+          -  వినియోగదారులు చట్టం గురించి తమ ప్రశ్నను అడగగలుగుతారు। 𓍝
+          -  వినియోగదారుల ప్రశ్నకు సమాధానం అందిస్తుంది। ✔
+          -  వినియోగదారు ప్రశ్నకు సంబంధించిన వివరణ, శిక్షలు, లాభాలు మరియు నష్టాలను ప్రదర్శిస్తుంది। ✉︎
+          -  చట్టంపై ప్రశ్నలను అడగడానికి వినియోగదారు-అనుకూల ఇంటర్‌ఫేస్ అందిస్తుంది। 🔗
+        - **ప్రాముఖ్యత:** సంభాషణ కృత్రిమ నుణ్ణి గుణం ద్వారా చట్ట సమాచారాన్ని అందించే లోనిపడి సరళత, సామర్థ్యం మరియు యాక్సెస్‌పై దృష్టి సారిస్తుంది। 📝
+        """
+    },
+    "Tamil - தமிழ்": {
+        "ask_query":"சட்ட உதவிக்கு உங்கள் கேள்வியைக் கேளுங்கள்",
+        "thinking": "சிந்தித்து கொண்டிருக்கிறேன் ✨...",
+        "no_response": "உங்கள் கேள்விக்கான பதிலை காணவில்லை.",
+        "positive_feedback": "👍 நல்ல கருத்து",
+        "negative_feedback": "👎 எதிர்மறை கருத்து",
+        "login_button": "உள்நுழைய",
+        "welcome": "வரவேற்கிறேன்",
+        "faq_button": "கேள்விகளை காண்பிக்கவும்",
+        "download_button": "அரட்டை வரலாற்றைப் பதிவிறக்கவும்",
+        "interaction_history": "உரையாடல் வரலாற்றைக் காண்பிக்கவும்",
+        "voice_query": "குரல் கேள்வி 🎙️",
+        "view_history": "வரலாற்றைக் காண்க 📜",
+        "download_law": "சட்டத்தை பதிவிறக்கவும் 📁",
+        "info_section": """
+        **சட்ட ஆலோசகர்போட்📄**
+        - **நோக்கம்:** சட்ட தகவல்கள் மற்றும் உதவியை வழங்குவதற்காக உருவாக்கப்பட்ட ஒரு உரையாடல் சாட் பாட்டை உருவாக்கியது.
+        - **ஒவ்வொரு குடிமகனும் சட்டங்களைப் பற்றி அறிந்திருக்க வேண்டும்.**
+        - **சாதனைகள்:**📜
+          -  பயனாளர்களுக்கு சட்டம் பற்றிய கேள்விகளை கேட்க அனுமதிக்கின்றது। 𓍝
+          -  பயனாளரின் கேள்விக்கு பதில் அளிக்கின்றது। ✔
+          -  பயனாளரின் கேள்விக்கு தொடர்புடைய விளக்கம், தண்டனைகள், நன்மைகள் மற்றும் தீமைகளை காட்டுகின்றது। ✉︎
+          -  சட்டங்களைப் பற்றி கேட்க பயனாளர் நட்பான இடைமுகத்தை வழங்குகிறது। 🔗
+        - **முக்கியத்துவம்:** உரையாடல் செயற்கை நுண்ணறிவு வழியாக சட்ட தகவல்களை வழங்குவதில் எளிமை, திறன் மற்றும் அணுகுமுறை என்பதிலுள்ள கவனம். 📝
+        """
+    },
+    "Kannada - ಕನ್ನಡ": {
+    "ask_query": "ನಿಮ್ಮ ಕಾನೂನು ಸಹಾಯಕ್ಕಾಗಿ ಪ್ರಶ್ನೆಯನ್ನು ಕೇಳಿ",
+    "thinking": "ಆಲೋಚನೆ ✨...",
+    "no_response": "ಕ್ಷಮಿಸಿ, ನಿಮ್ಮ ಪ್ರಶ್ನೆಗೆ ಹೊಂದುವ ಉತ್ತರವನ್ನು ನಾನು ಕಂಡುಹಿಡಿಯಲಿಲ್ಲ.",
+    "positive_feedback": "👍 ಉತ್ತಮ ಪ್ರತಿಕ್ರಿಯೆ",
+    "negative_feedback": "👎 ಹೀನಾಯ ಪ್ರತಿಕ್ರಿಯೆ",
+    "login_button": "ಲಾಗಿನ್",
+    "welcome": "ಸ್ವಾಗತ",
+    "faq_button": "FAQಗಳನ್ನು ತೋರಿಸಿ",
+    "download_button": "ಚಾಟ್ ಇತಿಹಾಸವನ್ನು PDFಗೆ ಡೌನ್‌ಲೋಡ್ ಮಾಡಿ",
+    "interaction_history": "ಇಂಟರಾಕ್ಷನ್ ಇತಿಹಾಸವನ್ನು ತೋರಿಸಿ",
+    "voice_query": "ಧ್ವನಿ ಪ್ರಶ್ನೆ 🎙️",
+    "view_history": "ಇತಿಹಾಸ ವೀಕ್ಷಿಸಿ 📜",
+    "download_law": "ಕಾನೂನು ಡೌನ್‌ಲೋಡ್ ಮಾಡಿ 📁",
+    "info_section": "**ಕಾನೂನು ಸಲಹೆಗಾರ ಬಾಟ್:📄**\n- **ಉದ್ದೇಶ:** ಕಾನೂನು ಮಾಹಿತಿ ಮತ್ತು ಸಹಾಯ ನೀಡಲು ಸಂವಾದಾತ್ಮಕ ಚಾಟ್‌ಬಾಟ್ ಅನ್ನು ಅಭಿವೃದ್ಧಿಪಡಿಸಲಾಗಿದೆ.\n- **ವೈಶಿಷ್ಟ್ಯಗಳು:**📜\n  - ಬಳಕೆದಾರರಿಗೆ ಕಾನೂನು ಪ್ರಶ್ನೆಯನ್ನು ಕೇಳಲು ಅವಕಾಶ ನೀಡುತ್ತದೆ.\n  - ಬಳಕೆದಾರರ ಪ್ರಶ್ನೆಗೆ ಉತ್ತರವನ್ನು ನೀಡುತ್ತದೆ. ✔\n  - ಕಾನೂನು ಪ್ರಶ್ನೆಗಳನ್ನು ಕೇಳಲು ಬಳಕೆದಾರ-ಹಿತಕರ ಇಂಟರ್‌ಫೇಸ್ ಅನ್ನು ಒದಗಿಸುತ್ತದೆ."
+},
+    "Malayalam - മലയാളം": {
+    "ask_query": "നിങ്ങളുടെ നിയമ സഹായത്തിനായുള്ള ചോദ്യം ചോദിക്കുക",
+    "thinking": "ചിന്തിക്കുന്നു ✨...",
+    "no_response": "ക്ഷമിക്കണം, നിങ്ങളുടെ ചോദ്യത്തിന് അനുയോജമായ പ്രതികരണം കണ്ടെത്താനായില്ല.",
+    "positive_feedback": "👍 സാന്ദര്യപരമായ പ്രതികരണം",
+    "negative_feedback": "👎 പ്രതികൂല പ്രതികരണം",
+    "login_button": "ലോഗിൻ",
+    "welcome": "സ്വാഗതം",
+    "faq_button": "FAQ കാണിക്കുക",
+    "download_button": "ചാറ്റ് ചരിത്രം PDF ആയി ഡൗൺലോഡ് ചെയ്യുക",
+    "interaction_history": "ഇന്ററാക്ഷൻ ചരിത്രം കാണിക്കുക",
+    "voice_query": "ശബ്ദ ചോദ്യം 🎙️",
+    "view_history": "ചരിത്രം കാണുക 📜",
+    "download_law": "നിയമം ഡൗൺലോഡ് ചെയ്യുക 📁",
+    "info_section": "**നിയമ ഉപദേഷ്ടാവ് ബോട്ട്:📄**\n- **ലക്ഷ്യം:** നിയമ വിവരങ്ങളും സഹായവും നൽകാൻ സംഭാഷണ ചാറ്റ്‌ബോട്ട് വികസിപ്പിച്ചിരിക്കുന്നു.\n- **സവിശേഷതകൾ:**📜\n  - ഉപയോക്താക്കളെ നിയമ ചോദ്യങ്ങൾ ചോദിക്കാൻ അനുവദിക്കുന്നു.\n  - ഉപയോക്തൃ ചോദ്യത്തിന് പ്രതികരണം നൽകുന്നു. ✔\n  - നിയമ ചോദ്യങ്ങൾ ചോദിക്കാൻ ഉപയോക്തൃ സൗഹൃദ ഇന്റർഫേസ് നൽകുന്നു."
+}
+}
+
+# Legal templates with file names
+legal_templates = {
+    "Rental Agreement": "rental_agreement_template.pdf",
+    "Loan Agreement":"loan-agreement-template.pdf",
+    "Employment Agreement": "employment_agreement_template.pdf",
+    "Business Agreement": "partnership_agreement_template.pdf",
+    "Freelancer Agreement": "freelancer_contract_template.pdf",
+    "Invoice Agreement": "invoice_template.pdf",
+    "Lease Agreement": "lease_agreement_template.pdf",
+    "Service Agreement": "service_agreement_template.pdf",
+    "Non-Disclosure Agreement": "nda_template.pdf"
+}
+
+# Custom CSS for the buttons
+BUTTON_CSS = """
+    <style>
+    /* Style the button to be black and full-width */
+    .stButton>button {
+        background-color: #0d0d0d !important; /* Black background */
+        border: 5px solid light-grey !important;   /* White border */
+        color: white !important;              /* White text */
+        width: 100% !important;               /* Full width */
+        height: 40px !important;              /* Fixed height */
+        border-radius: 10px !important;        /* Rounded corners */
+        cursor: pointer;                     /* Pointer cursor on hover */
+        font-size: 16px !important;           /* Font size */
+    }
+    .stButton>button:hover {
+        background-color: white !important;  /* White background on hover */
+        color: #4CAF50 !important;            /* Green text on hover */
+    }
+    </style>
+"""
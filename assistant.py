@@ -0,0 +1,103 @@
+"""The answer pipeline without any Streamlit dependency.
+
+A question is answered from the precomputed FAQ, then the shared answer
+cache, and only then by the model through the scheduler and host router.
+The web app, the load-test driver and other front ends all go through
+:func:`answer`, so they measure and serve exactly the same path.
+"""
+import os
+import time
+
+import answer_cache
+import cascade
+import faq_cache
+import llm_client
+import metrics
+import retrieval
+import router
+import scheduler
+from conversation import is_followup
+
+
+NOT_AVAILABLE = "Local LLM (Ollama) not available. Install from ollama.com and run: ollama run llama3.2"
+
+
+class AssistantUnavailable(llm_client.OllamaError):
+    """Raised while every backend host is known to be down."""
+
+
+def cache_enabled() -> bool:
+    return os.environ.get("ANSWER_CACHE", "1") != "0"
+
+
+def generate(query: str, language: str = "English", history: list | None = None, on_token=None,
+             stats: dict | None = None, on_queued=None) -> str | None:
+    """Ask the model, grounded in retrieved statutes and the earlier ``history`` messages.
+
+    Raises :class:`AssistantUnavailable`, ``scheduler.SchedulerBusy`` or
+    ``llm_client.OllamaError`` when no answer can be produced.
+    """
+    # Fail fast while every backend host is known to be down
+    backends = router.get_router()
+    if not backends.available():
+        raise AssistantUnavailable(NOT_AVAILABLE)
+
+    stats = stats if stats is not None else {}
+    start = time.perf_counter()
+    passages = retrieval.retrieve(query)
+    stats["retrieval"] = time.perf_counter() - start
+    messages = llm_client.build_messages(
+        query, sys_msg=llm_client.system_prompt(language), passages=passages, history=history,
+    )
+
+    queued = time.perf_counter()
+
+    def run():
+        stats["queue"] = time.perf_counter() - queued
+        # Simple questions go to the fast model first; see cascade.py
+        return cascade.generate(backends, messages, query, language, history, on_token=on_token, stats=stats)
+
+    # Shared scheduler caps concurrent generations; identical questions share one answer
+    return scheduler.get_scheduler().run(llm_client.request_key(messages), run, on_queued=on_queued)
+
+
+def answer(query: str, language: str = "English", memory=None, on_token=None, stats: dict | None = None,
+           on_queued=None) -> str | None:
+    """Answer ``query`` in ``language``, continuing the conversation in ``memory`` if given.
+
+    ``on_token`` receives the streamed text so far and ``on_queued`` the queue
+    position while waiting for a model slot. ``stats``, if given, receives
+    the stage timings that are also recorded in :mod:`metrics`. The same
+    exceptions as :func:`generate` propagate.
+    """
+    query = query.strip()
+    trace = stats if stats is not None else {}
+    start = time.perf_counter()
+    try:
+        # Frequent questions are served from the precomputed FAQ, then repeated questions from the
+        # shared answer cache, without a model call, unless the question refers back to earlier turns
+        standalone = not (memory is not None and len(memory) and is_followup(query))
+        reply = faq_cache.get_faq().lookup(language, query) if standalone else None
+        trace["faq"], trace["source"] = time.perf_counter() - start, "faq"
+        cache = answer_cache.get_cache() if cache_enabled() and standalone else None
+        scope = answer_cache.scope_key(llm_client.ollama_model(), llm_client.system_prompt(language), language)
+        if reply is None and cache:
+            looked_up = time.perf_counter()
+            reply = cache.get(scope, query)
+            trace["cache"], trace["source"] = time.perf_counter() - looked_up, "cache"
+        if reply is None:
+            trace["source"] = "model"
+            history = memory.messages() if memory is not None else None
+            reply = generate(query, language, history, on_token=on_token, stats=trace, on_queued=on_queued)
+            if reply and cache:
+                cache.put(scope, query, reply)
+        if reply and memory is not None:
+            memory.add(query, reply)
+        return reply
+    except Exception as e:
+        trace["error"] = type(e).__name__
+        raise
+    finally:
+        trace["answer"] = time.perf_counter() - start
+        trace["language"] = language
+        metrics.record(trace)
@@ -0,0 +1,176 @@
+"""Answer a file of questions in bulk through the app's answer pipeline.
+
+Reads JSONL (``{"id", "question", "language"}`` per line) or CSV (columns
+``id``, ``question``, ``language``; only ``question`` is required) and writes one
+JSON line per answered question to the output file as soon as it finishes.
+The output doubles as the checkpoint: re-running the same command skips
+every id already answered, so an interrupted run picks up where it stopped::
+
+    python batch_answer.py questions.jsonl answers.jsonl --workers 4
+    python batch_answer.py questions.csv answers.jsonl --fresh --language Hindi
+
+Prints a JSON summary with throughput and latency percentiles at the end.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import assistant
+import scheduler
+from app_content import language_label
+
+
+def read_items(path: str, default_language: str) -> list:
+    """``(id, question, language)`` for every non-empty question in a JSONL or CSV file."""
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            records = list(csv.DictReader(f))
+        else:
+            records = [json.loads(line) for line in f if line.strip()]
+    items = []
+    for number, record in enumerate(records, 1):
+        question = (record.get("question") or record.get("query") or "").strip()
+        if not question:
+            continue
+        language = language_label(record.get("language") or default_language) or default_language
+        # 0 is a valid id; a missing or blank one (e.g. an empty CSV cell) falls back to the row number
+        item_id = record.get("id")
+        if item_id is None or str(item_id).strip() == "":
+            item_id = number
+        items.append((str(item_id), question, language))
+    return items
+
+
+def finished_ids(path: str, retry_failed: bool) -> set:
+    """Ids already written to ``path``; a partially written last line is cut off."""
+    if not os.path.exists(path):
+        return set()
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+            data = data[:data.rfind(b"\n") + 1]
+    done = set()
+    for line in data.decode("utf-8").splitlines():
+        try:
+            result = json.loads(line)
+        except ValueError:
+            continue
+        if not (retry_failed and result.get("error")):
+            done.add(result["id"])
+    return done
+
+
+def answer_one(question: str, language: str, fresh: bool) -> dict:
+    stats = {}
+    start = time.perf_counter()
+    while True:
+        try:
+            if fresh:
+                answer = assistant.generate(question, language, stats=stats)
+                stats["source"] = "model"
+            else:
+                answer = assistant.answer(question, language, stats=stats)
+            error = None if answer else "empty answer"
+            break
+        except scheduler.SchedulerBusy:
+            # Shared with the web app; wait for room in the queue instead of failing the item
+            time.sleep(1.0)
+        except Exception as e:
+            answer, error = None, str(e) or type(e).__name__
+            break
+    return {
+        "answer": answer,
+        "source": stats.get("source"),
+        "error": error,
+        "seconds": round(time.perf_counter() - start, 4),
+        "tokens": stats.get("tokens"),
+    }
+
+
+def run(items: list, output: str, workers: int, fresh: bool = False, progress_every: float = 10.0) -> dict:
+    """Answer ``items`` with ``workers`` in parallel, appending each result to ``output``."""
+    latencies, sources = [], {}
+    counts = {"answered": 0, "failed": 0}
+    start = last_progress = time.perf_counter()
+    pending = iter(items)
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "a", encoding="utf-8") as out, ThreadPoolExecutor(max_workers=workers) as pool:
+        running = {}
+
+        def write(future):
+            item_id, question, language = running.pop(future)
+            result = {"id": item_id, "question": question, "language": language, **future.result()}
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            out.flush()
+            counts["failed" if result["error"] else "answered"] += 1
+            latencies.append(result["seconds"])
+            sources[result["source"]] = sources.get(result["source"], 0) + 1
+
+        try:
+            while True:
+                # Keep a small window in flight rather than queueing thousands of futures
+                for item_id, question, language in pending:
+                    running[pool.submit(answer_one, question, language, fresh)] = (item_id, question, language)
+                    if len(running) >= workers * 2:
+                        break
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    write(future)
+                now = time.perf_counter()
+                if now - last_progress >= progress_every:
+                    last_progress = now
+                    finished = counts["answered"] + counts["failed"]
+                    print(f"{finished}/{len(items)} done, {finished / (now - start):.2f} questions/s", file=sys.stderr)
+        except KeyboardInterrupt:
+            print("Interrupted; finishing questions already being answered. "
+                  "Re-run the same command to resume.", file=sys.stderr)
+            counts["interrupted"] = True
+            pool.shutdown(wait=False, cancel_futures=True)
+            # Items already running still finish when the pool exits; keep their answers
+            for future in [f for f in running if f.cancelled()]:
+                running.pop(future)
+            for future in wait(running).done:
+                write(future)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+
+    def pct(q):
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] if latencies else None
+
+    finished = counts["answered"] + counts["failed"]
+    return {
+        **counts,
+        "seconds": round(elapsed, 2),
+        "questions_per_s": round(finished / elapsed, 3) if elapsed else None,
+        "latency_p50_s": pct(0.5),
+        "latency_p95_s": pct(0.95),
+        "sources": sources,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Answer a JSONL or CSV file of questions in bulk.")
+    parser.add_argument("input", help=".jsonl or .csv with a 'question' field")
+    parser.add_argument("output", help="JSONL results file; also the resume checkpoint")
+    parser.add_argument("--workers", type=int, default=scheduler.default_max_in_flight() * 2)
+    parser.add_argument("--language", default="English", help="for rows without a language")
+    parser.add_argument("--fresh", action="store_true", help="always ask the model, bypassing the FAQ and answer cache")
+    parser.add_argument("--retry-failed", action="store_true", help="re-run items whose earlier attempt failed")
+    args = parser.parse_args()
+
+    language = language_label(args.language)
+    if language is None:
+        parser.error(f"unknown language {args.language!r}")
+    items = read_items(args.input, language)
+    done = finished_ids(args.output, args.retry_failed)
+    todo = [item for item in items if item[0] not in done]
+    report = run(todo, args.output, args.workers, fresh=args.fresh)
+    print(json.dumps({"total": len(items), "skipped": len(items) - len(todo), **report}))
@@ -0,0 +1,168 @@
+"""Drive the app's hot paths under concurrent load and report latency, throughput and memory.
+
+Each simulated session asks ``--session-length`` questions through the same
+pipeline as the web app (:func:`assistant.answer`), appends every turn to its
+interaction log, then exports the log to PDF and emails a template. By
+default a stub Ollama server and an SMTP sink are started in-process, so no
+model or mail server is needed::
+
+    python benchmarks/load_test.py --sessions 32 --concurrency 8 --latency 0.2 --tokens-per-second 40
+
+Prints one JSON object with p50/p95/p99 latency, error count and throughput
+per operation, plus wall time and peak resident memory.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from smtp_sink import start_sink
+from stub_ollama import start_stub
+
+
+class Recorder:
+    """Latency samples and error counts per operation, shared by all sessions."""
+
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def time(self, name: str, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            with self._lock:
+                self.errors[name] = self.errors.get(name, 0) + 1
+            return None
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.samples.setdefault(name, []).append(elapsed)
+        return result
+
+    def report(self, wall: float) -> dict:
+        def pct(values, q):
+            return round(values[min(len(values) - 1, int(q * len(values)))] * 1000, 2)
+
+        report = {}
+        for name in sorted(set(self.samples) | set(self.errors)):
+            values = sorted(self.samples.get(name, []))
+            report[name] = {
+                "count": len(values),
+                "errors": self.errors.get(name, 0),
+                "p50_ms": pct(values, 0.50) if values else None,
+                "p95_ms": pct(values, 0.95) if values else None,
+                "p99_ms": pct(values, 0.99) if values else None,
+                "throughput_per_s": round(len(values) / wall, 2) if wall else None,
+            }
+        return report
+
+
+def read_questions(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+def run_session(session: int, args, questions: list, recorder: Recorder) -> None:
+    import assistant
+    import email_service
+    import pdf_export
+    from conversation import ConversationMemory
+    from interaction_store import InteractionLog
+
+    rng = random.Random(session)
+    memory = ConversationMemory()
+    log = InteractionLog(f"load-{session}")
+    for turn in range(args.session_length):
+        question = rng.choice(questions)
+        if not args.repeat_questions:
+            # Distinct numbers keep questions from merging in the scheduler or hitting the cache
+            question = f"{question} (case {session}-{turn})"
+        reply = recorder.time("get_response", assistant.answer, question, args.language, memory)
+        recorder.time("log_append", log.append, question, reply or "")
+    recorder.time("generate_pdf_from_log", pdf_export.generate_pdf_from_log, log.rows())
+    if not args.no_email:
+        recorder.time("send_email", _send, email_service, args.attachment)
+
+
+def _send(email_service, attachment: str | None) -> None:
+    if not email_service.send_email("load@example.com", "Your Legal Document", "Load test.", attachment):
+        raise RuntimeError("send failed")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=16, help="simulated users")
+    parser.add_argument("--concurrency", type=int, default=4, help="sessions running at once")
+    parser.add_argument("--session-length", type=int, default=5, help="questions per session")
+    parser.add_argument("--questions", default=os.path.join(ROOT, "faq_questions.txt"))
+    parser.add_argument("--repeat-questions", action="store_true", help="allow cache hits and shared generations")
+    parser.add_argument("--language", default="English")
+    parser.add_argument("--ollama", help="use this Ollama host instead of the built-in stub")
+    parser.add_argument("--latency", type=float, default=0.05, help="stub seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="stub token rate, 0 for instant")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="stub fraction of failed chat requests")
+    parser.add_argument("--attachment", default=os.path.join(ROOT, "templates", "nda_template.pdf"),
+                        help="PDF attached to the email sent at the end of each session, if it exists")
+    parser.add_argument("--no-email", action="store_true", help="skip the email step")
+    parser.add_argument("--out", help="also write the JSON report to this file")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="legal-load-")
+    stub = None if args.ollama else start_stub(latency=args.latency, tokens_per_second=args.tokens_per_second,
+                                               error_rate=args.error_rate)
+    sink = start_sink()
+    # Configure before the app modules are imported; they read their settings on import
+    os.environ.pop("OLLAMA_HOSTS", None)
+    os.environ.update({
+        "OLLAMA_HOST": args.ollama or f"http://127.0.0.1:{stub.server_address[1]}",
+        "APP_DATA_DIR": workdir,
+        "FAQ_PATH": os.path.join(workdir, "faq.sqlite3"),
+        "SMTP_HOST": "127.0.0.1",
+        "SMTP_PORT": str(sink.server_address[1]),
+        "SMTP_STARTTLS": "0",
+    })
+    os.environ.pop("SMTP_USERNAME", None)
+    if args.attachment and not os.path.exists(args.attachment):
+        args.attachment = None
+
+    import metrics
+
+    questions = read_questions(args.questions)
+    recorder = Recorder()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        for future in [pool.submit(run_session, s, args, questions, recorder) for s in range(args.sessions)]:
+            future.result()
+    wall = time.perf_counter() - start
+
+    report = {
+        "config": {k: v for k, v in vars(args).items() if k != "out"},
+        "wall_seconds": round(wall, 3),
+        "sessions_per_s": round(args.sessions / wall, 2),
+        # ru_maxrss is in KiB on Linux; includes the in-process stub and sink
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "emails_received": sink.messages,
+        "operations": recorder.report(wall),
+        # Per-stage breakdown of get_response (queue, connect, load, prompt_eval, generation, ...)
+        "stages": metrics.snapshot()["histograms"],
+    }
+    print(json.dumps(report, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Local SMTP server that accepts and discards mail, for load tests of the email path.
+
+Speaks just enough plain SMTP (no TLS, no auth) for ``smtplib``: point the app
+at it with ``SMTP_HOST=127.0.0.1 SMTP_PORT=<port> SMTP_STARTTLS=0``::
+
+    python benchmarks/smtp_sink.py --port 2525
+"""
+import argparse
+import socketserver
+import threading
+
+
+class SinkHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line: str) -> None:
+        self.wfile.write(line.encode("ascii") + b"\r\n")
+
+    def handle(self):
+        self._reply("220 smtp-sink ready")
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode("utf-8", "replace").strip().split(" ", 1)[0].upper()
+            if command == "EHLO":
+                self._reply("250-smtp-sink")
+                self._reply("250 SIZE 52428800")
+            elif command == "DATA":
+                self._reply("354 end data with <CR><LF>.<CR><LF>")
+                size = 0
+                for data in iter(self.rfile.readline, b""):
+                    if data in (b".\r\n", b".\n"):
+                        break
+                    size += len(data)
+                with self.server.lock:
+                    self.server.messages += 1
+                    self.server.bytes += size
+                self._reply("250 OK queued")
+            elif command == "QUIT":
+                self._reply("221 bye")
+                return
+            elif command in ("HELO", "MAIL", "RCPT", "RSET", "NOOP"):
+                self._reply("250 OK")
+            else:
+                self._reply("502 command not implemented")
+
+
+def start_sink(port: int = 0) -> socketserver.ThreadingTCPServer:
+    """Start the sink on a daemon thread; ``server.messages`` counts accepted messages."""
+    socketserver.ThreadingTCPServer.allow_reuse_address = True
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", port), SinkHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.messages = server.bytes = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run an SMTP server that discards mail.")
+    parser.add_argument("--port", type=int, default=2525)
+    args = parser.parse_args()
+
+    server = start_sink(args.port)
+    print(f"SMTP sink listening on 127.0.0.1:{server.server_address[1]}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,75 @@
+"""Measure import time and resident memory of the app's subsystems.
+
+Each scenario runs in a fresh interpreter, so numbers reflect a cold
+process: the core query path alone, then with the voice, PDF and email
+stacks (and pandas) loaded on top. Prints one JSON object per scenario::
+
+    python benchmarks/startup_bench.py --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CORE = "import llm_client, answer_cache, retrieval, router, scheduler, conversation, interaction_store, template_registry"
+SCENARIOS = {
+    "streamlit": "import streamlit",
+    "core": CORE,
+    "core+voice": CORE + "; import voice; voice.get_engine(); import speech_recognition",
+    "core+pdf": CORE + "; import pdf_export; pdf_export.render_pdf([('q', 'a')])",
+    "core+email": CORE + "; import email_outbox",
+    "core+pandas": CORE + "; import pandas",
+    "all": CORE + "; import voice; voice.get_engine(); import speech_recognition; import pdf_export; "
+                  "pdf_export.render_pdf([('q', 'a')]); import email_outbox; import pandas",
+}
+
+PROBE = """
+import json, time
+def rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+before = rss_kb()
+start = time.perf_counter()
+error = None
+try:
+    exec({code!r})
+except Exception as e:
+    error = repr(e)
+print(json.dumps({{"seconds": time.perf_counter() - start, "rss_kb": rss_kb(), "rss_delta_kb": rss_kb() - before, "error": error}}))
+"""
+
+
+def measure(code: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(code=code)], cwd=ROOT, capture_output=True, text=True, check=True,
+        env=dict(os.environ, APP_DATA_DIR=os.environ.get("APP_DATA_DIR", os.path.join(ROOT, "data", "bench"))),
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="run only these scenarios")
+    args = parser.parse_args()
+
+    for name in args.scenario or SCENARIOS:
+        runs = [measure(SCENARIOS[name]) for _ in range(args.repeat)]
+        print(json.dumps({
+            "scenario": name,
+            "import_ms_median": round(statistics.median(r["seconds"] for r in runs) * 1000, 1),
+            "rss_mb_median": round(statistics.median(r["rss_kb"] for r in runs) / 1024, 1),
+            "rss_delta_mb_median": round(statistics.median(r["rss_delta_kb"] for r in runs) / 1024, 1),
+            "error": runs[-1]["error"],
+        }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Local stand-in for an Ollama server, for load tests and multi-host routing.
+
+Serves ``/api/tags``, ``/api/chat`` (streaming NDJSON or single response),
+``/api/generate`` (model warm-up) and ``/v1/chat/completions`` (SSE or single
+response) with configurable latency, token rate and error rate::
+
+    python benchmarks/stub_ollama.py --port 11500 --latency 0.2 --tokens-per-second 40
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+ANSWER = (
+    "Section 420 of the Indian Penal Code covers cheating and dishonestly inducing delivery of property. "
+    "It is punishable with imprisonment of up to seven years and a fine. "
+    "This is general information, not legal advice."
+)
+
+
+class StubConfig:
+    def __init__(self, latency: float = 0.0, tokens_per_second: float = 0.0, error_rate: float = 0.0,
+                 answer: str = ANSWER, model: str = "llama3.2:1b"):
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.answer = answer
+        self.model = model
+        self.requests = 0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config = StubConfig()
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_chunk(self, data: bytes) -> None:
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._send_json(200, {"models": [{"name": self.config.model}]})
+        elif self.path == "/v1/models":
+            self._send_json(200, {"data": [{"id": self.config.model}]})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        self.config.requests += 1
+        if self.path == "/api/generate":
+            self._send_json(200, {"model": request.get("model"), "response": "", "done": True})
+            return
+        if self.path not in ("/api/chat", "/v1/chat/completions"):
+            self._send_json(404, {"error": "not found"})
+            return
+        if random.random() < self.config.error_rate:
+            self._send_json(500, {"error": "injected failure"})
+            return
+
+        start = time.perf_counter()
+        time.sleep(self.config.latency)
+        words = [w + " " for w in self.config.answer.split(" ")]
+        num_predict = (request.get("options") or {}).get("num_predict")
+        done_reason = "stop"
+        if num_predict and num_predict < len(words):
+            words, done_reason = words[:num_predict], "length"
+        delay = 1 / self.config.tokens_per_second if self.config.tokens_per_second else 0
+        native = self.path == "/api/chat"
+        final = {
+            "model": request.get("model"),
+            "done": True,
+            "done_reason": done_reason,
+            "load_duration": 1_000_000,
+            "prompt_eval_count": sum(len(m.get("content", "")) // 4 for m in request.get("messages", [])),
+            "prompt_eval_duration": int(self.config.latency * 1e9),
+            "eval_count": len(words),
+            "eval_duration": int(delay * len(words) * 1e9),
+        }
+
+        if not request.get("stream"):
+            time.sleep(delay * len(words))
+            text = "".join(words).strip()
+            final["total_duration"] = int((time.perf_counter() - start) * 1e9)
+            if native:
+                self._send_json(200, dict(final, message={"role": "assistant", "content": text}))
+            else:
+                finish = "length" if done_reason == "length" else "stop"
+                self._send_json(200, {"choices": [{"message": {"role": "assistant", "content": text}, "finish_reason": finish}]})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson" if native else "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for word in words:
+            time.sleep(delay)
+            if native:
+                self._send_chunk((json.dumps({"message": {"role": "assistant", "content": word}, "done": False}) + "\n").encode())
+            else:
+                self._send_chunk(b"data: " + json.dumps({"choices": [{"delta": {"content": word}}]}).encode() + b"\n\n")
+        if native:
+            final["total_duration"] = int((time.perf_counter() - start) * 1e9)
+            self._send_chunk((json.dumps(dict(final, message={"role": "assistant", "content": ""})) + "\n").encode())
+        else:
+            self._send_chunk(b"data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+def start_stub(port: int = 0, **config) -> ThreadingHTTPServer:
+    """Start a stub server on a daemon thread; ``server.server_address`` has the bound port."""
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"config": StubConfig(**config)})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a fake Ollama server.")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="0 sends all tokens at once")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of chat requests answered with HTTP 500")
+    parser.add_argument("--model", default="llama3.2:1b")
+    args = parser.parse_args()
+
+    server = start_stub(args.port, latency=args.latency, tokens_per_second=args.tokens_per_second,
+                        error_rate=args.error_rate, model=args.model)
+    print(f"Stub Ollama listening on http://127.0.0.1:{server.server_address[1]}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
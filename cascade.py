@@ -0,0 +1,131 @@
+"""Two-tier model cascade: a small fast model first, a larger one only when needed.
+
+Each question is scored for complexity with cheap local heuristics. Simple
+ones (short, definitional, a single section) go to ``OLLAMA_FAST_MODEL``
+with a tight ``FAST_NUM_PREDICT`` budget; everything else, and any fast
+answer that comes back empty, truncated or hedged, goes to
+``OLLAMA_STRONG_MODEL`` (default ``OLLAMA_MODEL``) with
+``STRONG_NUM_PREDICT`` (``0`` = no cap). Without a fast model configured
+every question goes straight to the strong tier, as before.
+
+The fast tier is not streamed: its answer is only shown once accepted, so
+an escalated question never shows (or speaks) a discarded draft.
+"""
+import os
+import re
+import time
+
+
+FAST, STRONG = "fast", "strong"
+
+SECTION_NUMBER = re.compile(r"\d+[A-Za-z]?")
+SCENARIO = re.compile(
+    r"\b(what should i|can i|should i|my|me|if|whether|scenario|compare|comparison|difference between|versus|vs"
+    r"|explain in detail|in detail|step by step|procedure|process|draft|appeal|both|also|and then)\b",
+    re.IGNORECASE,
+)
+DEFINITION = re.compile(r"^\s*(what is|what are|what does|define|meaning of|punishment for|explain section)\b",
+                        re.IGNORECASE)
+HEDGE = re.compile(
+    r"\b(i'?m not sure|i am not sure|i don'?t know|i do not know|can(?:not|'t) (?:answer|help|provide)"
+    r"|unable to (?:answer|help|provide)|no information)\b",
+    re.IGNORECASE,
+)
+
+
+def fast_model() -> str | None:
+    return os.environ.get("OLLAMA_FAST_MODEL") or None
+
+
+def strong_model() -> str | None:
+    """None means each host's own model (``OLLAMA_MODEL`` unless set in ``OLLAMA_HOSTS``).
+
+    Hosts configured for the fast model are then avoided, or asked for ``OLLAMA_MODEL`` instead.
+    """
+    return os.environ.get("OLLAMA_STRONG_MODEL") or None
+
+
+def token_budget(tier: str) -> int:
+    if tier == FAST:
+        return int(os.environ.get("FAST_NUM_PREDICT", "256"))
+    return int(os.environ.get("STRONG_NUM_PREDICT", "0"))
+
+
+def classify(query: str, language: str = "English", history: list | None = None) -> tuple:
+    """``(tier, reasons)`` for ``query``; reasons name the features that made it complex."""
+    words = query.split()
+    score, reasons = 0, []
+
+    def add(points: int, reason: str) -> None:
+        nonlocal score
+        score += points
+        reasons.append(reason)
+
+    if len(words) > 20:
+        add(2, "long")
+    elif len(words) > 12:
+        add(1, "long")
+    if query.count("?") > 1:
+        add(2, "several questions")
+    if len(set(SECTION_NUMBER.findall(query))) > 1:
+        add(1, "several sections")
+    scenario = {m.lower() for m in SCENARIO.findall(query)}
+    if scenario:
+        add(min(len(scenario), 2), "scenario")
+    if history:
+        add(1, "follow-up")
+    if language != "English":
+        # Small models are much weaker outside English
+        add(1, "language")
+    if DEFINITION.match(query) and len(words) <= 12:
+        score -= 1
+    return (STRONG if score >= 2 else FAST), reasons
+
+
+def weakness(reply: str | None, stats: dict) -> str | None:
+    """Why a fast-tier answer should not be trusted, or None to accept it."""
+    if not reply or not reply.strip():
+        return "empty"
+    if stats.get("done_reason") == "length":
+        return "truncated"
+    if len(reply.split()) < 8:
+        return "too short"
+    if HEDGE.search(reply):
+        return "low confidence"
+    return None
+
+
+def _options(tier: str) -> dict | None:
+    budget = token_budget(tier)
+    return {"num_predict": budget} if budget > 0 else None
+
+
+def generate(backends, messages: list, query: str, language: str = "English", history: list | None = None,
+             on_token=None, stats: dict | None = None) -> str | None:
+    """Answer through the cascade on ``backends`` (a :class:`router.Router`), recording the route in ``stats``."""
+    stats = stats if stats is not None else {}
+    tier, reasons = classify(query, language, history)
+    small = fast_model()
+    if small is None:
+        tier, reasons = STRONG, ["no fast model"]
+    stats["tier"], stats["route_reasons"] = tier, reasons
+
+    if tier == FAST:
+        # Own stats dict: timings of a discarded fast answer must not end up in the trace of the strong one
+        fast_stats = {}
+        start = time.perf_counter()
+        try:
+            reply = backends.generate(messages, stats=fast_stats, model=small, options=_options(FAST))
+            why = weakness(reply, fast_stats)
+        except Exception as e:
+            reply, why = None, f"error: {type(e).__name__}"
+        stats["fast_seconds"] = time.perf_counter() - start
+        if why is None:
+            stats.update(fast_stats)
+            if on_token:
+                on_token(reply)
+            return reply
+        stats["escalated"], stats["escalation_reason"] = True, why
+
+    return backends.generate(messages, on_token=on_token, stats=stats, model=strong_model(),
+                             options=_options(STRONG), avoid_model=small)
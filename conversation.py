@@ -0,0 +1,73 @@
+import os
+import re
+
+
+# Words that make a question depend on earlier turns ("what is the punishment for it?")
+FOLLOWUP_WORDS = frozenset(
+    "it its this that these those they them their he she his her above same previous earlier "
+    "यह वह इसका उसका".split()
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate; errs high so Indic scripts stay inside the budget."""
+    return len(text) // 3 + 1
+
+
+def is_followup(query: str) -> bool:
+    words = [w for w in re.split(r"[\s?.,!;:\"'()।]+", query.casefold()) if w]
+    return len(words) <= 12 and any(w in FOLLOWUP_WORDS for w in words)
+
+
+def _first_sentence(text: str, limit: int = 160) -> str:
+    sentence = re.split(r"(?<=[.!?।])\s", text.strip(), maxsplit=1)[0]
+    return sentence[:limit]
+
+
+class ConversationMemory:
+    """Rolling, token-budgeted window of recent turns for one chat session.
+
+    When the window exceeds ``max_tokens`` the oldest turns are folded into a
+    short extractive summary until it is back under half the budget. Trimming
+    in batches keeps the message prefix identical between most turns, so a
+    loaded Ollama model can reuse its prompt cache instead of re-evaluating it.
+    """
+
+    def __init__(self, max_tokens: int | None = None, summary_tokens: int | None = None):
+        self.max_tokens = max_tokens or int(os.environ.get("CONVERSATION_MAX_TOKENS", "1200"))
+        self.summary_tokens = summary_tokens or int(os.environ.get("CONVERSATION_SUMMARY_TOKENS", "200"))
+        self.turns = []
+        self.summary = []
+        self._tokens = 0
+
+    def __len__(self) -> int:
+        return len(self.turns)
+
+    def add(self, user: str, assistant: str) -> None:
+        self.turns.append((user, assistant))
+        self._tokens += estimate_tokens(user) + estimate_tokens(assistant)
+        if self._tokens > self.max_tokens:
+            self._fold(self.max_tokens // 2)
+
+    def _fold(self, target: int) -> None:
+        while self.turns and self._tokens > target:
+            user, assistant = self.turns.pop(0)
+            self._tokens -= estimate_tokens(user) + estimate_tokens(assistant)
+            self.summary.append(f"- Q: {user[:120]} A: {_first_sentence(assistant)}")
+        while len(self.summary) > 1 and estimate_tokens("\n".join(self.summary)) > self.summary_tokens:
+            self.summary.pop(0)
+
+    def messages(self) -> list:
+        """Chat messages for the window, oldest first, to place before the new question."""
+        messages = []
+        if self.summary:
+            messages.append({"role": "system", "content": "Earlier in this conversation:\n" + "\n".join(self.summary)})
+        for user, assistant in self.turns:
+            messages.append({"role": "user", "content": user})
+            messages.append({"role": "assistant", "content": assistant})
+        return messages
+
+    def clear(self) -> None:
+        self.turns.clear()
+        self.summary.clear()
+        self._tokens = 0
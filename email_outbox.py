@@ -0,0 +1,131 @@
+import os
+import sqlite3
+import threading
+import time
+
+from email_service import SMTPConnection, build_message, smtp_settings
+
+
+DEFAULT_PATH = os.path.join(os.environ.get("APP_DATA_DIR", "data"), "outbox.sqlite3")
+QUEUED, SENDING, SENT, FAILED = "queued", "sending", "sent", "failed"
+
+_outbox = None
+_outbox_lock = threading.Lock()
+
+
+class Outbox:
+    """Persistent email queue drained by one background sender.
+
+    Messages are stored in SQLite, so queued mail survives a restart. The
+    sender keeps a single authenticated SMTP session open across messages
+    and closes it after ``idle_close`` seconds without work. Failed sends
+    are retried with exponential backoff up to ``max_attempts`` times.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, max_attempts: int = 5, backoff: float = 5.0,
+                 idle_close: float = 60.0, settings: dict | None = None):
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.idle_close = idle_close
+        self.settings = settings
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, to_email TEXT NOT NULL, subject TEXT NOT NULL,"
+            " body TEXT NOT NULL, attachment_path TEXT, status TEXT NOT NULL, attempts INTEGER NOT NULL DEFAULT 0,"
+            " next_attempt REAL NOT NULL, last_error TEXT, created REAL NOT NULL, updated REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt)")
+        # A message caught mid-send by a restart is retried
+        self._db.execute("UPDATE outbox SET status = ? WHERE status = ?", (QUEUED, SENDING))
+        self._db.commit()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+
+    def start(self) -> "Outbox":
+        self._thread.start()
+        return self
+
+    def enqueue(self, to_email: str, subject: str, body: str, attachment_path: str | None = None) -> int:
+        """Queue a message and return its id; delivery happens in the background."""
+        now = time.time()
+        with self._lock:
+            cur = self._db.execute(
+                "INSERT INTO outbox (to_email, subject, body, attachment_path, status, next_attempt, created, updated)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (to_email, subject, body, attachment_path, QUEUED, now, now, now),
+            )
+            self._db.commit()
+        self._wake.set()
+        return cur.lastrowid
+
+    def status(self, message_id: int) -> dict | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, to_email, status, attempts, last_error FROM outbox WHERE id = ?", (message_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("id", "to_email", "status", "attempts", "last_error"), row))
+
+    def _due(self, limit: int = 20) -> list:
+        with self._lock:
+            return self._db.execute(
+                "SELECT id, to_email, subject, body, attachment_path, attempts FROM outbox"
+                " WHERE status = ? AND next_attempt <= ? ORDER BY id LIMIT ?",
+                (QUEUED, time.time(), limit),
+            ).fetchall()
+
+    def _update(self, message_id: int, **fields) -> None:
+        fields["updated"] = time.time()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._db.execute(f"UPDATE outbox SET {columns} WHERE id = ?", (*fields.values(), message_id))
+            self._db.commit()
+
+    def _run(self) -> None:
+        connection = SMTPConnection(self.settings or smtp_settings())
+        idle_since = time.monotonic()
+        while True:
+            batch = self._due()
+            for message_id, to_email, subject, body, attachment_path, attempts in batch:
+                self._update(message_id, status=SENDING)
+                try:
+                    msg = build_message(to_email, subject, body, attachment_path, sender=connection.settings["sender"])
+                except OSError as e:
+                    # A missing attachment will not appear on retry
+                    self._update(message_id, status=FAILED, attempts=attempts + 1, last_error=str(e))
+                    continue
+                try:
+                    connection.send(msg, to_email)
+                except Exception as e:
+                    connection.close()
+                    attempts += 1
+                    if attempts >= self.max_attempts:
+                        self._update(message_id, status=FAILED, attempts=attempts, last_error=str(e))
+                    else:
+                        delay = min(self.backoff * 2 ** (attempts - 1), 600)
+                        self._update(message_id, status=QUEUED, attempts=attempts, last_error=str(e),
+                                     next_attempt=time.time() + delay)
+                else:
+                    self._update(message_id, status=SENT, attempts=attempts + 1, last_error=None)
+            if batch:
+                idle_since = time.monotonic()
+                continue
+            if time.monotonic() - idle_since > self.idle_close:
+                connection.close()
+            self._wake.wait(1.0)
+            self._wake.clear()
+
+
+def get_outbox() -> Outbox:
+    """Return the process-wide outbox, starting its sender on first use."""
+    global _outbox
+    with _outbox_lock:
+        if _outbox is None:
+            _outbox = Outbox(os.environ.get("OUTBOX_PATH", DEFAULT_PATH)).start()
+        return _outbox
@@ -1,38 +1,125 @@
 import os
 import smtplib
+import threading
+import time
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.application import MIMEApplication
 
+from template_registry import read_file
 
-def send_email(to_email: str, subject: str, body: str, attachment_path: str | None = None) -> bool:
+
+def smtp_settings() -> dict:
+    """SMTP connection settings from the environment (Gmail with STARTTLS by default)."""
+    username = os.environ.get("SMTP_USERNAME")
+    return {
+        "host": os.environ.get("SMTP_HOST", "smtp.gmail.com"),
+        "port": int(os.environ.get("SMTP_PORT", "587")),
+        "starttls": os.environ.get("SMTP_STARTTLS", "1") != "0",
+        "username": username,
+        "password": os.environ.get("SMTP_PASSWORD"),
+        "sender": os.environ.get("SMTP_FROM") or username or "your_email@example.com",
+    }
+
+
+def is_configured() -> bool:
+    """Credentials are required unless an explicit (e.g. local) SMTP_HOST is set."""
+    settings = smtp_settings()
+    return bool(settings["username"] and settings["password"]) or "SMTP_HOST" in os.environ
+
+
+def build_message(to_email: str, subject: str, body: str, attachment_path: str | None = None,
+                  sender: str | None = None) -> MIMEMultipart:
     msg = MIMEMultipart()
-    msg['From'] = "your_email@example.com"
+    msg['From'] = sender or smtp_settings()["sender"]
     msg['To'] = to_email
     msg['Subject'] = subject
 
     msg.attach(MIMEText(body, 'plain'))
 
     if attachment_path:
-        with open(attachment_path, "rb") as file:
-            attach_part = MIMEApplication(file.read())
-            import os as _os
-            attach_part.add_header('Content-Disposition', 'attachment', filename=_os.path.basename(attachment_path))
-            msg.attach(attach_part)
+        # Templates come from the shared registry cache instead of being re-read per message
+        attach_part = MIMEApplication(read_file(attachment_path))
+        attach_part.add_header('Content-Disposition', 'attachment', filename=os.path.basename(attachment_path))
+        msg.attach(attach_part)
+    return msg
+
+
+class SMTPConnection:
+    """An authenticated SMTP session reused across messages.
+
+    The connection is opened (STARTTLS + login) on first use, checked with
+    NOOP after it has been idle, and reopened transparently when the server
+    has dropped it.
+    """
 
+    def __init__(self, settings: dict | None = None, idle_check: float = 30):
+        self.settings = settings or smtp_settings()
+        self.idle_check = idle_check
+        self._server = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+
+    def _open(self) -> smtplib.SMTP:
+        s = self.settings
+        server = smtplib.SMTP(s["host"], s["port"], timeout=30)
+        try:
+            if s["starttls"]:
+                server.starttls()
+            if s["username"]:
+                server.login(s["username"], s["password"] or "")
+        except BaseException:
+            server.close()
+            raise
+        return server
+
+    def _alive(self) -> bool:
+        if self._server is None:
+            return False
+        if time.monotonic() - self._last_used < self.idle_check:
+            return True
+        try:
+            return self._server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def send(self, msg: MIMEMultipart, to_email: str) -> None:
+        """Send ``msg``; raises on failure after one reconnect attempt."""
+        with self._lock:
+            for attempt in (1, 2):
+                if not self._alive():
+                    self.close()
+                    self._server = self._open()
+                try:
+                    self._server.sendmail(msg['From'], to_email, msg.as_string())
+                    self._last_used = time.monotonic()
+                    return
+                except smtplib.SMTPServerDisconnected:
+                    self._server = None
+                    if attempt == 2:
+                        raise
+
+    def close(self) -> None:
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._server = None
+
+
+def send_email(to_email: str, subject: str, body: str, attachment_path: str | None = None) -> bool:
     try:
-        smtp_username = os.environ.get("SMTP_USERNAME")
-        smtp_password = os.environ.get("SMTP_PASSWORD")
-        if not smtp_username or not smtp_password:
+        settings = smtp_settings()
+        if not is_configured():
             raise RuntimeError("Missing SMTP_USERNAME/SMTP_PASSWORD environment variables")
 
-        msg['From'] = smtp_username
-
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(smtp_username, smtp_password)
-        server.sendmail(msg['From'], to_email, msg.as_string())
-        server.close()
+        msg = build_message(to_email, subject, body, attachment_path, sender=settings["sender"])
+        connection = SMTPConnection(settings)
+        try:
+            connection.send(msg, to_email)
+        finally:
+            connection.close()
         return True
     except Exception:
         return False
@@ -0,0 +1,208 @@
+"""Precomputed answers to frequent legal questions in every supported language.
+
+The cache is built offline in one batch from a question list and stored in
+SQLite. The app looks a question up here before anything else, so common
+questions are answered without a model call in any language, and only the
+long tail reaches the model::
+
+    python faq_cache.py build faq_questions.txt --workers 2
+    python faq_cache.py query "what is the punishment for cheating" --language Hindi
+
+For each language except English the builder also asks the model to
+translate the question, so a question typed in the user's own script
+matches as well as the English wording.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from answer_cache import normalize, similarity
+from app_content import LANGUAGES, language_label
+
+
+DEFAULT_PATH = os.path.join(os.environ.get("APP_DATA_DIR", "data"), "faq.sqlite3")
+
+_faq = None
+_faq_lock = threading.Lock()
+
+
+class FAQCache:
+    """Read side of the FAQ store, held in memory and reloaded when the file changes."""
+
+    def __init__(self, path: str = DEFAULT_PATH, min_similarity: float | None = None, check_interval: float = 30.0):
+        self.path = path
+        self.min_similarity = min_similarity if min_similarity is not None else float(os.environ.get("FAQ_SIMILARITY", "0"))
+        self.check_interval = check_interval
+        self._entries = {}  # language -> {normalized question: answer}
+        self._mtime = None
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if now - self._checked < self.check_interval:
+            return
+        self._checked = now
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            self._entries, self._mtime = {}, None
+            return
+        if mtime == self._mtime:
+            return
+        entries = {}
+        db = sqlite3.connect(self.path)
+        try:
+            for language, norm, answer in db.execute("SELECT language, norm, answer FROM faq"):
+                entries.setdefault(language, {})[norm] = answer
+        except sqlite3.OperationalError:
+            pass
+        finally:
+            db.close()
+        self._entries, self._mtime = entries, mtime
+
+    def lookup(self, language: str, query: str) -> str | None:
+        """Precomputed answer for ``query`` in ``language``, or None."""
+        norm = normalize(query)
+        with self._lock:
+            self._refresh()
+            entries = self._entries.get(language)
+        if not entries or not norm:
+            return None
+        if norm in entries:
+            return entries[norm]
+        if self.min_similarity <= 0:
+            return None
+        score, answer = max((similarity(norm, known), answer) for known, answer in entries.items())
+        return answer if score >= self.min_similarity else None
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._refresh()
+            return sum(len(entries) for entries in self._entries.values())
+
+
+def get_faq() -> FAQCache:
+    """Return the process-wide FAQ cache."""
+    global _faq
+    with _faq_lock:
+        if _faq is None:
+            _faq = FAQCache(os.environ.get("FAQ_PATH", DEFAULT_PATH))
+        return _faq
+
+
+def _open_store(path: str) -> sqlite3.Connection:
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    db = sqlite3.connect(path, check_same_thread=False)
+    db.execute(
+        "CREATE TABLE IF NOT EXISTS faq ("
+        " language TEXT NOT NULL, norm TEXT NOT NULL, question TEXT NOT NULL, source TEXT NOT NULL,"
+        " answer TEXT NOT NULL, model TEXT NOT NULL, created REAL NOT NULL, PRIMARY KEY (language, norm))"
+    )
+    db.commit()
+    return db
+
+
+def read_questions(path: str) -> list:
+    """Questions from a text file (one per line, ``#`` comments) or JSONL with a "question" field."""
+    questions = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            questions.append(json.loads(line)["question"] if path.endswith(".jsonl") else line)
+    return questions
+
+
+def _answer_one(question: str, language: str) -> tuple:
+    import llm_client
+    import retrieval
+    import router
+
+    backends = router.get_router()
+    translated = None
+    if language != "English":
+        name = language.split(" - ")[0]
+        translated = backends.generate([
+            {"role": "system", "content": f"Translate the user's question into {name}. Reply with the translation only."},
+            {"role": "user", "content": question},
+        ])
+    messages = llm_client.build_messages(
+        question, sys_msg=llm_client.system_prompt(language), passages=retrieval.retrieve(question),
+    )
+    return translated, backends.generate(messages)
+
+
+def build(questions: list, languages: list, path: str = DEFAULT_PATH, workers: int = 2, force: bool = False) -> dict:
+    """Answer every question in every language and store the results.
+
+    Entries already built with the current model are skipped unless ``force``.
+    Returns counts of built, skipped and failed entries.
+    """
+    import llm_client
+
+    model = llm_client.ollama_model()
+    db = _open_store(path)
+    done = set()
+    if not force:
+        done = set(db.execute("SELECT language, source FROM faq WHERE model = ?", (model,)))
+    jobs = [(q, lang) for lang in languages for q in questions if (lang, q) not in done]
+    counts = {"built": 0, "skipped": len(questions) * len(languages) - len(jobs), "failed": 0}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_answer_one, q, lang): (q, lang) for q, lang in jobs}
+        for future in as_completed(futures):
+            question, language = futures[future]
+            try:
+                translated, answer = future.result()
+            except Exception:
+                translated, answer = None, None
+            if not answer:
+                counts["failed"] += 1
+                continue
+            now = time.time()
+            for phrasing in {question, (translated or "").strip()} - {""}:
+                db.execute(
+                    "INSERT OR REPLACE INTO faq (language, norm, question, source, answer, model, created)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (language, normalize(phrasing), phrasing, question, answer, model, now),
+                )
+            db.commit()
+            counts["built"] += 1
+    db.close()
+    return counts
+
+
+def _language(value: str) -> str:
+    language = language_label(value)
+    if language is None:
+        raise argparse.ArgumentTypeError(f"unknown language {value!r}; choose from {', '.join(LANGUAGES)}")
+    return language
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or query the multilingual FAQ answer cache.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build_cmd = sub.add_parser("build", help="answer a question list in every language")
+    build_cmd.add_argument("questions", help=".txt (one question per line) or .jsonl")
+    build_cmd.add_argument("--language", type=_language, action="append", help="default: every supported language")
+    build_cmd.add_argument("--workers", type=int, default=2)
+    build_cmd.add_argument("--force", action="store_true", help="rebuild entries that already exist")
+    build_cmd.add_argument("--out", default=os.environ.get("FAQ_PATH", DEFAULT_PATH))
+    query_cmd = sub.add_parser("query", help="look a question up")
+    query_cmd.add_argument("text")
+    query_cmd.add_argument("--language", type=_language, default="English")
+    query_cmd.add_argument("--path", default=os.environ.get("FAQ_PATH", DEFAULT_PATH))
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        counts = build(read_questions(args.questions), args.language or LANGUAGES, args.out, args.workers, args.force)
+        print(json.dumps({**counts, "seconds": round(time.perf_counter() - start, 1), "path": args.out}))
+    else:
+        print(FAQCache(args.path).lookup(args.language, args.text) or "(no precomputed answer)")
@@ -0,0 +1,120 @@
+import os
+import threading
+import time
+
+import requests
+
+import llm_client
+
+
+_monitors = {}
+_monitors_lock = threading.Lock()
+
+
+class OllamaMonitor:
+    """Background health checker and circuit breaker for one Ollama host.
+
+    A daemon thread polls ``/api/tags`` (``/v1/models`` on OpenAI-compatible
+    servers) and keeps the result in memory, so page reruns read cached
+    state instead of making a request. While the circuit is open the query
+    path fails fast; it closes again on the next successful poll. Once an
+    Ollama host is up the model is pre-loaded with ``keep_alive`` so the
+    first real question does not pay the load time.
+    """
+
+    PATHS = {llm_client.NATIVE: "/api/tags", llm_client.OPENAI: "/v1/models"}
+
+    def __init__(self, host: str, model: str, interval: float | None = None, failure_threshold: int = 2):
+        self.host = host
+        self.model = model
+        self.interval = interval or float(os.environ.get("OLLAMA_HEALTH_INTERVAL", "15"))
+        self.retry_interval = min(self.interval, 3.0)
+        self.failure_threshold = failure_threshold
+        self.healthy = None  # unknown until the first poll finishes
+        self.endpoint = None
+        self.warmed = False
+        self.last_error = None
+        self.last_checked = 0.0
+        self._failures = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"ollama-health-{host}", daemon=True)
+
+    def start(self) -> "OllamaMonitor":
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while True:
+            up = self.check()
+            if up and not self.warmed:
+                self.warm_up()
+            self._wake.wait(self.interval if up else self.retry_interval)
+            self._wake.clear()
+
+    def check(self) -> bool:
+        try:
+            self.endpoint = llm_client.probe_endpoint(self.host)
+            r = llm_client.get_session().get(f"{self.host}{self.PATHS[self.endpoint]}", timeout=2)
+            up, error = r.status_code == 200, f"HTTP {r.status_code}"
+            if not up:
+                # The server may have been swapped for another flavour; probe again next time
+                llm_client.forget_endpoint(self.host)
+        except (llm_client.OllamaError, requests.RequestException) as e:
+            up, error = False, str(e)
+        with self._lock:
+            self.last_checked = time.time()
+            if up:
+                self.healthy, self._failures, self.last_error = True, 0, None
+            else:
+                self.healthy, self.warmed, self.last_error = False, False, error
+        return up
+
+    def warm_up(self) -> None:
+        """Load the model into memory; an empty /api/generate request does only that."""
+        if self.endpoint == llm_client.OPENAI:
+            # OpenAI-compatible servers have no load-only request; they manage their own models
+            self.warmed = True
+            return
+        try:
+            llm_client.get_session().post(
+                f"{self.host}/api/generate",
+                json={"model": self.model, "keep_alive": llm_client.keep_alive()},
+                timeout=300,
+            )
+            # Any HTTP answer ends the attempt; hosts without /api/generate are not retried
+            self.warmed = True
+        except requests.RequestException:
+            self.warmed = False
+
+    def allow_request(self) -> bool:
+        """False while the backend is known to be down (circuit open)."""
+        return self.healthy is not False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.healthy, self._failures = True, 0
+
+    def record_failure(self, error: str = "") -> None:
+        """Count a failed query; enough of them in a row open the circuit and trigger a re-check."""
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self.healthy, self.last_error = False, error or self.last_error
+        self._wake.set()
+
+    def status(self) -> str:
+        if self.healthy is None:
+            return "checking"
+        if not self.healthy:
+            return "down"
+        return "ready" if self.warmed else "warming"
+
+
+def get_monitor(host: str | None = None, model: str | None = None) -> OllamaMonitor:
+    """Return the process-wide monitor for ``host``, starting it on first use."""
+    host = host or llm_client.ollama_host()
+    with _monitors_lock:
+        if host not in _monitors:
+            _monitors[host] = OllamaMonitor(host, model or llm_client.ollama_model()).start()
+        return _monitors[host]
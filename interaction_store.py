@@ -0,0 +1,173 @@
+import csv
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+import time
+
+
+DEFAULT_PATH = os.path.join(os.environ.get("APP_DATA_DIR", "data"), "history.sqlite3")
+COLUMNS = ["user_query", "assistant_response"]
+
+_connections = {}
+_connections_lock = threading.Lock()
+
+
+def _connect(path: str):
+    """Return the shared connection and lock for ``path``, creating the schema once."""
+    with _connections_lock:
+        if path not in _connections:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            db = sqlite3.connect(path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS interactions ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT, user TEXT NOT NULL, ts REAL NOT NULL,"
+                " user_query TEXT NOT NULL, assistant_response TEXT NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS interactions_user ON interactions (user, id)")
+            _create_search_index(db)
+            db.commit()
+            _connections[path] = (db, threading.Lock())
+        return _connections[path]
+
+
+def user_token(user: str) -> str:
+    """Single index token standing for ``user``, whatever characters the name has."""
+    return "u" + hashlib.sha1(user.encode("utf-8")).hexdigest()[:16]
+
+
+def _create_search_index(db: sqlite3.Connection) -> None:
+    """Full-text index over both sides of every turn, kept in sync by triggers.
+
+    unicode61 without diacritic folding keeps Devanagari, Telugu, Tamil,
+    Kannada and Malayalam vowel signs intact, so words in those scripts
+    match exactly. Each row also carries :func:`user_token` in ``uid``, so a
+    search is narrowed to one user inside the index rather than ranking
+    every user's matches first. Existing histories (and indexes built by
+    older versions) are indexed once.
+    """
+    columns = [row[1] for row in db.execute("PRAGMA table_info(interactions)")]
+    if "uid" not in columns:
+        db.execute("ALTER TABLE interactions ADD COLUMN uid TEXT")
+    found = db.execute("SELECT sql FROM sqlite_master WHERE name = 'interactions_fts'").fetchone()
+    if found and " uid," not in found[0]:
+        db.execute("DROP TRIGGER IF EXISTS interactions_ai")
+        db.execute("DROP TRIGGER IF EXISTS interactions_ad")
+        db.execute("DROP TABLE interactions_fts")
+        found = None
+    if not found:
+        users = [row[0] for row in db.execute("SELECT DISTINCT user FROM interactions WHERE uid IS NULL")]
+        db.executemany("UPDATE interactions SET uid = ? WHERE user = ?", [(user_token(u), u) for u in users])
+    db.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS interactions_fts USING fts5("
+        " uid, user_query, assistant_response, content='interactions', content_rowid='id',"
+        " tokenize='unicode61 remove_diacritics 0')"
+    )
+    db.execute(
+        "CREATE TRIGGER IF NOT EXISTS interactions_ai AFTER INSERT ON interactions BEGIN"
+        " INSERT INTO interactions_fts (rowid, uid, user_query, assistant_response)"
+        " VALUES (new.id, new.uid, new.user_query, new.assistant_response); END"
+    )
+    db.execute(
+        "CREATE TRIGGER IF NOT EXISTS interactions_ad AFTER DELETE ON interactions BEGIN"
+        " INSERT INTO interactions_fts (interactions_fts, rowid, uid, user_query, assistant_response)"
+        " VALUES ('delete', old.id, old.uid, old.user_query, old.assistant_response); END"
+    )
+    if not found:
+        db.execute("INSERT INTO interactions_fts (interactions_fts) VALUES ('rebuild')")
+
+
+def _match_expression(text: str) -> str:
+    """FTS5 query matching every word of ``text`` (the last one as a prefix), with syntax escaped."""
+    words = ['"' + word.replace('"', '""') + '"' for word in text.split()]
+    if words:
+        words[-1] += "*"
+    return " ".join(words)
+
+
+class InteractionLog:
+    """Append-only interaction history for one user, persisted in SQLite.
+
+    Appends are single-row inserts; a DataFrame is only built when a caller
+    (history view, CSV or PDF export) asks for one.
+    """
+
+    def __init__(self, user: str, path: str | None = None):
+        self.user = user
+        self._db, self._lock = _connect(path or os.environ.get("HISTORY_PATH", DEFAULT_PATH))
+
+    def __len__(self) -> int:
+        return self.version[1]
+
+    @property
+    def version(self) -> tuple:
+        """``(last id, row count)``; changes on every append or clear, from any session."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT COALESCE(MAX(id), 0), COUNT(*) FROM interactions WHERE user = ?", (self.user,)
+            ).fetchone()
+
+    def append(self, user_query: str, assistant_response: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO interactions (user, uid, ts, user_query, assistant_response) VALUES (?, ?, ?, ?, ?)",
+                (self.user, user_token(self.user), time.time(), user_query, assistant_response),
+            )
+            self._db.commit()
+
+    def rows(self) -> list:
+        """All ``(user_query, assistant_response)`` pairs, oldest first."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT user_query, assistant_response FROM interactions WHERE user = ? ORDER BY id", (self.user,)
+            ).fetchall()
+
+    def page(self, offset: int = 0, limit: int = 20) -> list:
+        """``(id, ts, user_query, assistant_response)`` rows, newest first, read straight off the index."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT id, ts, user_query, assistant_response FROM interactions WHERE user = ?"
+                " ORDER BY id DESC LIMIT ? OFFSET ?",
+                (self.user, limit, offset),
+            ).fetchall()
+
+    def search(self, text: str, offset: int = 0, limit: int = 20) -> tuple:
+        """Best-matching turns for ``text`` as ``(rows, more)``; rows are shaped like :meth:`page`.
+
+        ``more`` tells whether another page follows, which avoids counting every match.
+        """
+        match = _match_expression(text)
+        if not match:
+            return [], False
+        # This user's rows are selected inside the index; the text only matches the conversation columns
+        match = f'uid : "{user_token(self.user)}" AND {{user_query assistant_response}} : ({match})'
+        with self._lock:
+            # CROSS JOIN keeps the full-text index as the outer loop
+            rows = self._db.execute(
+                "SELECT i.id, i.ts, i.user_query, i.assistant_response"
+                " FROM interactions_fts f CROSS JOIN interactions i ON i.id = f.rowid"
+                " WHERE interactions_fts MATCH ? AND i.user = ? ORDER BY f.rank LIMIT ? OFFSET ?",
+                (match, self.user, limit + 1, offset),
+            ).fetchall()
+        return rows[:limit], len(rows) > limit
+
+    def to_dataframe(self):
+        import pandas as pd
+        return pd.DataFrame(self.rows(), columns=COLUMNS)
+
+    def to_csv(self) -> bytes:
+        """UTF-8 CSV of the history, written straight from SQLite without pandas."""
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(COLUMNS)
+        writer.writerows(self.rows())
+        return out.getvalue().encode("utf-8")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM interactions WHERE user = ?", (self.user,))
+            self._db.commit()
@@ -0,0 +1,264 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+DEFAULT_HOST = "http://localhost:11434"
+DEFAULT_MODEL = "llama3.2:1b"
+SYSTEM_PROMPT = "You provide non-advisory legal information for India. Keep answers concise with a brief disclaimer."
+
+NATIVE = "native"  # Ollama /api/chat
+OPENAI = "openai"  # OpenAI-compatible /v1/chat/completions
+
+# One keep-alive connection pool per process, shared by every Streamlit session
+_session = None
+_session_lock = threading.Lock()
+# Host -> endpoint flavour, probed once and reused until a request fails
+_endpoints = {}
+_endpoints_lock = threading.Lock()
+
+
+class OllamaError(Exception):
+    """Raised when the local Ollama backend cannot produce an answer.
+
+    ``status`` is the HTTP status of the failed request, when there was one.
+    """
+
+    def __init__(self, message: str = "", status: int | None = None):
+        super().__init__(message)
+        self.status = status
+
+
+def ollama_host() -> str:
+    return os.environ.get("OLLAMA_HOST", DEFAULT_HOST)
+
+
+def ollama_model() -> str:
+    return os.environ.get("OLLAMA_MODEL", DEFAULT_MODEL)
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide HTTP session with pooled keep-alive connections."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                pool_size = int(os.environ.get("OLLAMA_POOL_SIZE", "16"))
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def probe_endpoint(host: str, timeout: float = 2) -> str:
+    """Return which chat endpoint ``host`` serves, probing it only on first use."""
+    endpoint = _endpoints.get(host)
+    if endpoint:
+        return endpoint
+    session = get_session()
+    for candidate, path in ((NATIVE, "/api/tags"), (OPENAI, "/v1/models")):
+        try:
+            if session.get(f"{host}{path}", timeout=timeout).status_code == 200:
+                with _endpoints_lock:
+                    _endpoints[host] = candidate
+                return candidate
+        except requests.RequestException:
+            break
+    raise OllamaError("Local LLM (Ollama) not available. Install from ollama.com and run: ollama run llama3.2")
+
+
+def forget_endpoint(host: str) -> None:
+    """Drop the cached probe result so the next request re-probes ``host``."""
+    with _endpoints_lock:
+        _endpoints.pop(host, None)
+
+
+def keep_alive() -> str:
+    """How long Ollama keeps the model (and its prompt cache) loaded between requests."""
+    return os.environ.get("OLLAMA_KEEP_ALIVE", "30m")
+
+
+def system_prompt(language: str = "English") -> str:
+    """System prompt asking for answers in ``language`` (a sidebar label such as "Hindi - हिन्दी")."""
+    name = language.split(" - ")[0].strip()
+    if not name or name == "English":
+        return SYSTEM_PROMPT
+    return f"{SYSTEM_PROMPT} Always answer in {name}, in its native script, whatever language the question is in."
+
+
+def build_messages(query: str, sys_msg: str = SYSTEM_PROMPT, passages: list | None = None,
+                   history: list | None = None) -> list:
+    """System prompt, then earlier ``history`` messages, then the new question.
+
+    Retrieved ``passages`` go into the last message so the earlier prefix stays
+    identical from turn to turn.
+    """
+    user_msg = f"User question: {query}"
+    if passages:
+        excerpts = "\n\n".join(passages)
+        user_msg = f"Relevant statute excerpts:\n{excerpts}\n\nUse the excerpts above where they apply.\n{user_msg}"
+    return [{"role": "system", "content": sys_msg}, *(history or []), {"role": "user", "content": user_msg}]
+
+
+def _not_ready(endpoint: str, status: int, model: str) -> OllamaError:
+    if endpoint == NATIVE:
+        return OllamaError(f"Ollama not ready (HTTP {status}). Ensure the model '{model}' is pulled: ollama run {model}",
+                           status)
+    return OllamaError(f"Ollama compatibility endpoint not ready (HTTP {status}). Try again after model download finishes.",
+                       status)
+
+
+def _payload(endpoint: str, model: str, messages: list, stream: bool, options: dict | None = None) -> dict:
+    payload = {"model": model, "messages": messages, "stream": stream}
+    if endpoint == NATIVE:
+        payload["keep_alive"] = keep_alive()
+        if options:
+            payload["options"] = options
+    elif options and options.get("num_predict"):
+        payload["max_tokens"] = options["num_predict"]
+    return payload
+
+
+def _record_timings(stats: dict | None, data: dict) -> None:
+    """Copy the backend's own timings and token counts from a final response into ``stats``.
+
+    Native Ollama reports ``load_duration``, ``prompt_eval_duration`` and
+    ``eval_duration`` in nanoseconds; OpenAI-compatible responses only carry
+    token ``usage``.
+    """
+    if stats is None:
+        return
+    for field, name in (("load_duration", "load"), ("prompt_eval_duration", "prompt_eval"),
+                        ("eval_duration", "generation"), ("total_duration", "backend_total")):
+        if data.get(field) is not None:
+            stats[name] = data[field] / 1e9
+    usage = data.get("usage") or {}
+    prompt_tokens = data.get("prompt_eval_count", usage.get("prompt_tokens"))
+    tokens = data.get("eval_count", usage.get("completion_tokens"))
+    if prompt_tokens is not None:
+        stats["prompt_tokens"] = prompt_tokens
+    if tokens is not None:
+        stats["tokens"] = tokens
+        if stats.get("generation"):
+            stats["tokens_per_second"] = tokens / stats["generation"]
+    reason = data.get("done_reason") or (data.get("choices") or [{}])[0].get("finish_reason")
+    if reason:
+        stats["done_reason"] = reason
+
+
+def _iter_content(endpoint: str, r, stats: dict | None = None):
+    """Yield text pieces from an NDJSON (native) or SSE (OpenAI) chat stream.
+
+    Timings from the final chunk are recorded into ``stats``.
+    """
+    for line in r.iter_lines():
+        if not line:
+            continue
+        if endpoint == NATIVE:
+            chunk = json.loads(line)
+            if chunk.get("error"):
+                raise OllamaError(f"Ollama error: {chunk['error']}")
+            content = (chunk.get("message") or {}).get("content")
+            if content:
+                yield content
+            if chunk.get("done"):
+                _record_timings(stats, chunk)
+                return
+        else:
+            if not line.startswith(b"data:"):
+                continue
+            data = line[5:].strip()
+            if data == b"[DONE]":
+                return
+            chunk = json.loads(data)
+            if chunk.get("usage") or (chunk.get("choices") or [{}])[0].get("finish_reason"):
+                _record_timings(stats, chunk)
+            delta = (chunk.get("choices") or [{}])[0].get("delta") or {}
+            if delta.get("content"):
+                yield delta["content"]
+
+
+def stream_chat(messages: list, model: str, host: str, stats: dict | None = None, timeout: int = 120,
+                options: dict | None = None):
+    """Yield answer chunks from the host's chat endpoint as they arrive.
+
+    If ``stats`` is given it is filled with ``connect`` (seconds until the
+    response headers), ``ttft`` (seconds until the first non-empty chunk),
+    ``total`` (seconds until the stream finished) and the backend timings
+    described in :func:`_record_timings`.
+    """
+    endpoint = probe_endpoint(host)
+    path = "/api/chat" if endpoint == NATIVE else "/v1/chat/completions"
+    start = time.perf_counter()
+    try:
+        with get_session().post(f"{host}{path}", json=_payload(endpoint, model, messages, True, options), timeout=timeout, stream=True) as r:
+            if stats is not None:
+                stats["connect"] = time.perf_counter() - start
+            if r.status_code != 200:
+                raise _not_ready(endpoint, r.status_code, model)
+            for content in _iter_content(endpoint, r, stats):
+                if stats is not None and "ttft" not in stats:
+                    stats["ttft"] = time.perf_counter() - start
+                yield content
+    except (OllamaError, requests.RequestException):
+        forget_endpoint(host)
+        raise
+    if stats is not None:
+        stats["total"] = time.perf_counter() - start
+
+
+def chat(messages: list, model: str, host: str, stats: dict | None = None, timeout: int = 120,
+         options: dict | None = None) -> str | None:
+    """Return the full answer from the host's chat endpoint in one response."""
+    endpoint = probe_endpoint(host)
+    path = "/api/chat" if endpoint == NATIVE else "/v1/chat/completions"
+    start = time.perf_counter()
+    try:
+        r = get_session().post(f"{host}{path}", json=_payload(endpoint, model, messages, False, options), timeout=timeout)
+        if r.status_code != 200:
+            raise _not_ready(endpoint, r.status_code, model)
+    except (OllamaError, requests.RequestException):
+        forget_endpoint(host)
+        raise
+    data = r.json()
+    _record_timings(stats, data)
+    if endpoint == NATIVE:
+        msg = (data.get("message") or {}).get("content")
+    else:
+        msg = (data.get("choices") or [{}])[0].get("message", {}).get("content")
+    if stats is not None:
+        stats["ttft"] = stats["total"] = time.perf_counter() - start
+    return (msg or "").strip() or None
+
+
+def request_key(messages: list, model: str | None = None) -> str:
+    """Identity of a generation request; identical in-flight requests share one answer."""
+    raw = json.dumps([model or ollama_model(), messages], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def generate(messages: list, on_token=None, stats: dict | None = None, host: str | None = None,
+             model: str | None = None, options: dict | None = None) -> str | None:
+    """Answer the chat ``messages`` (see :func:`build_messages`) on one host.
+
+    ``host`` and ``model`` default to ``OLLAMA_HOST``/``OLLAMA_MODEL``. When
+    ``on_token`` is given the answer is streamed and ``on_token`` is called
+    with the text accumulated so far after every chunk. ``options`` are
+    Ollama model options such as ``{"num_predict": 256}``.
+    """
+    host, model = host or ollama_host(), model or ollama_model()
+    if on_token is None:
+        return chat(messages, model, host, stats=stats, options=options)
+
+    text = ""
+    for piece in stream_chat(messages, model, host, stats=stats, options=options):
+        text += piece
+        on_token(text)
+    return text.strip() or None
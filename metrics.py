@@ -0,0 +1,199 @@
+"""Per-stage latency histograms for the query pipeline.
+
+Every answered question leaves a trace: a flat dict of stage timings in
+seconds (``queue``, ``connect``, ``load``, ``prompt_eval``, ``generation``,
+``render``, ``answer`` end to end, ...) plus token counts and the answer source. :func:`record`
+folds it into process-wide histograms, optionally appends it to a rotating
+JSON-lines log (``METRICS_LOG``) and the aggregates can be served over HTTP
+(``METRICS_PORT``) in Prometheus text format at ``/metrics`` or as JSON at
+``/metrics.json``.
+"""
+import bisect
+import json
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Upper bounds in seconds; the last bucket catches everything slower
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, float("inf"))
+RATE_BUCKETS = (1, 2, 5, 10, 20, 30, 50, 75, 100, 150, 250, float("inf"))
+STAGES = ("faq", "cache", "retrieval", "queue", "fast_seconds", "connect", "load", "prompt_eval", "ttft",
+          "generation", "total", "render", "answer")
+# A model load longer than this means Ollama had to (re)load the weights
+LOAD_STALL_SECONDS = 1.0
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+_log = None
+_server = None
+_serve_attempted = False
+
+
+class Histogram:
+    """Fixed-bucket histogram for Prometheus, plus the most recent samples for percentiles.
+
+    Bucket bounds are too coarse to read percentiles from (everything in the
+    top occupied bucket would report its bound or ``max``), so p50/p95/p99
+    are taken exactly over the last ``recent`` observations instead.
+    """
+
+    def __init__(self, buckets: tuple = BUCKETS, recent: int = 1000):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self._recent = deque(maxlen=recent)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        self._recent.append(value)
+
+    def percentile(self, q: float) -> float | None:
+        if not self._recent:
+            return None
+        ordered = sorted(self._recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+        }
+
+
+class _RotatingLog:
+    """Append-only JSON-lines file rotated to ``.1`` .. ``.N`` when it grows past ``max_bytes``."""
+
+    def __init__(self, path: str, max_bytes: int, backups: int = 3):
+        self.path, self.max_bytes, self.backups = path, max_bytes, backups
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def write(self, entry: dict) -> None:
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        try:
+            if os.path.getsize(self.path) + len(line) > self.max_bytes:
+                for i in range(self.backups - 1, 0, -1):
+                    if os.path.exists(f"{self.path}.{i}"):
+                        os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+                os.replace(self.path, f"{self.path}.1")
+        except FileNotFoundError:
+            pass
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+def _histogram(name: str, buckets: tuple = BUCKETS) -> Histogram:
+    if name not in _histograms:
+        _histograms[name] = Histogram(buckets)
+    return _histograms[name]
+
+
+def _count(name: str) -> None:
+    _counters[name] = _counters.get(name, 0) + 1
+
+
+def observe(stage: str, seconds: float) -> None:
+    """Record one timing that is not part of a pipeline trace (e.g. page render)."""
+    with _lock:
+        _histogram(stage).observe(seconds)
+
+
+def record(trace: dict) -> None:
+    """Fold one request's trace into the histograms and the JSON log."""
+    global _log
+    with _lock:
+        _count("requests")
+        _count(f"source_{trace.get('source', 'none')}")
+        if trace.get("error"):
+            _count("errors")
+        for stage in STAGES:
+            if isinstance(trace.get(stage), (int, float)):
+                _histogram(stage).observe(trace[stage])
+        if trace.get("tokens_per_second"):
+            _histogram("tokens_per_second", RATE_BUCKETS).observe(trace["tokens_per_second"])
+        if trace.get("tier"):
+            _count(f"tier_{trace['tier']}")
+        if trace.get("escalated"):
+            _count("escalations")
+        if (trace.get("load") or 0) >= LOAD_STALL_SECONDS:
+            _count("model_load_stalls")
+        path = os.environ.get("METRICS_LOG")
+        if path:
+            if _log is None or _log.path != path:
+                _log = _RotatingLog(path, int(os.environ.get("METRICS_LOG_BYTES", str(10 * 1024 * 1024))))
+            _log.write({"ts": time.time(), **trace})
+
+
+def snapshot() -> dict:
+    with _lock:
+        return {
+            "counters": dict(_counters),
+            "histograms": {name: h.snapshot() for name, h in _histograms.items()},
+        }
+
+
+def prometheus() -> str:
+    """The aggregates in Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        for name, value in sorted(_counters.items()):
+            lines.append(f"legal_assistant_{name}_total {value}")
+        for name, h in sorted(_histograms.items()):
+            metric = f"legal_assistant_{name}" + ("" if name == "tokens_per_second" else "_seconds")
+            cumulative = 0
+            for bound, count in zip(h.buckets, h.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{metric}_bucket{{le="{le}"}} {cumulative}')
+            lines.append(f"{metric}_sum {h.sum}")
+            lines.append(f"{metric}_count {h.count}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            body, content_type = prometheus().encode("utf-8"), "text/plain; version=0.0.4"
+        elif self.path == "/metrics.json":
+            body, content_type = json.dumps(snapshot()).encode("utf-8"), "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(port: int | None = None) -> ThreadingHTTPServer | None:
+    """Start the local metrics endpoint once per process when ``METRICS_PORT`` (or ``port``) is set."""
+    global _server, _serve_attempted
+    port = port if port is not None else int(os.environ.get("METRICS_PORT", "0"))
+    with _lock:
+        if not _serve_attempted and port:
+            _serve_attempted = True
+            try:
+                _server = ThreadingHTTPServer(("127.0.0.1", port), _MetricsHandler)
+            except OSError:
+                # Another process (e.g. a second Streamlit worker) already serves this port
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+        return _server
@@ -1,27 +1,167 @@
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
+import glob
+import io
+import os
 import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# reportlab is imported inside the render functions so it only loads on the first export
+
+
+EXPORT_DIR = os.path.join(os.environ.get("APP_DATA_DIR", "data"), "exports")
+FONT_DIRS = [
+    os.environ.get("PDF_FONT_DIR", "fonts"),
+    "/usr/share/fonts/truetype/noto",
+    "/usr/share/fonts/opentype/noto",
+    "/usr/share/fonts/noto",
+]
+# Font registered for each script, with the Noto files that provide it
+SCRIPT_FONTS = {
+    "latin": ("NotoSans", ["NotoSans-Regular.ttf", "DejaVuSans.ttf"]),
+    "devanagari": ("NotoSansDevanagari", ["NotoSansDevanagari-Regular.ttf"]),
+    "telugu": ("NotoSansTelugu", ["NotoSansTelugu-Regular.ttf"]),
+    "tamil": ("NotoSansTamil", ["NotoSansTamil-Regular.ttf"]),
+    "kannada": ("NotoSansKannada", ["NotoSansKannada-Regular.ttf"]),
+    "malayalam": ("NotoSansMalayalam", ["NotoSansMalayalam-Regular.ttf"]),
+}
+SCRIPT_RANGES = [
+    (0x0900, 0x097F, "devanagari"),
+    (0x0B80, 0x0BFF, "tamil"),
+    (0x0C00, 0x0C7F, "telugu"),
+    (0x0C80, 0x0CFF, "kannada"),
+    (0x0D00, 0x0D7F, "malayalam"),
+]
+FONT_SIZE = 11
+LEADING = 14
+MARGIN = 60
+CACHE_SIZE = 8
+KEEP_FILES = 20
+
+_fonts = None
+_fonts_lock = threading.Lock()
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_jobs = {}
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pdf-export")
+
+
+def _registered_fonts() -> dict:
+    """Register the Unicode fonts found on disk once; script -> font name."""
+    global _fonts
+    with _fonts_lock:
+        if _fonts is None:
+            from reportlab.pdfbase import pdfmetrics
+            from reportlab.pdfbase.ttfonts import TTFont
+            _fonts = {}
+            for script, (name, files) in SCRIPT_FONTS.items():
+                for path in (os.path.join(d, f) for d in FONT_DIRS for f in files):
+                    if os.path.exists(path):
+                        pdfmetrics.registerFont(TTFont(name, path))
+                        _fonts[script] = name
+                        break
+        return _fonts
+
+
+def _script_of(text: str) -> str:
+    for ch in text:
+        code = ord(ch)
+        for low, high, script in SCRIPT_RANGES:
+            if low <= code <= high:
+                return script
+    return "latin"
+
+
+def _font_for(text: str) -> str:
+    fonts = _registered_fonts()
+    return fonts.get(_script_of(text)) or fonts.get("latin") or "Helvetica"
+
+
+def _iter_rows(interaction_log):
+    """Yield ``(user_query, assistant_response)`` pairs from a DataFrame or an iterable of pairs."""
+    if hasattr(interaction_log, "itertuples"):
+        return interaction_log[["user_query", "assistant_response"]].itertuples(index=False, name=None)
+    return iter(interaction_log)
+
+
+def render_pdf(interaction_log) -> bytes:
+    """Render the chat history to PDF bytes, wrapping long answers across lines and pages."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.utils import simpleSplit
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    width, height = letter
+    c = canvas.Canvas(buffer, pagesize=letter)
+    header_font = _font_for("")
+    c.setFont(header_font, 14)
+    c.drawString(MARGIN, height - MARGIN, "Legal Laws Assistant - Chat History")
+    y = height - MARGIN - 30
+
+    def draw(label: str, text: str, indent: int) -> None:
+        nonlocal y
+        font = _font_for(text)
+        for paragraph in f"{label}{text}".splitlines() or [""]:
+            for line in simpleSplit(paragraph, font, FONT_SIZE, width - 2 * MARGIN - indent) or [""]:
+                if y < MARGIN:
+                    c.showPage()
+                    y = height - MARGIN
+                c.setFont(font, FONT_SIZE)
+                c.drawString(MARGIN + indent, y, line)
+                y -= LEADING
+
+    for user_query, assistant_response in _iter_rows(interaction_log):
+        draw("User: ", str(user_query), 0)
+        draw("Assistant: ", str(assistant_response), 20)
+        y -= LEADING
+    c.save()
+    return buffer.getvalue()
+
+
+def export_pdf(key, rows_fn) -> bytes:
+    """Return cached PDF bytes for ``key`` (e.g. user and log version), rendering ``rows_fn()`` on a miss."""
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    data = render_pdf(rows_fn())
+    with _cache_lock:
+        _cache[key] = data
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return data
+
+
+def export_pdf_async(key, rows_fn) -> Future:
+    """Like :func:`export_pdf` but renders in a background worker; concurrent calls share one job."""
+    with _cache_lock:
+        if key in _cache:
+            future = Future()
+            future.set_result(_cache[key])
+            return future
+        future = _jobs.get(key)
+        if future is None:
+            future = _jobs[key] = _executor.submit(export_pdf, key, rows_fn)
+            future.add_done_callback(lambda _: _jobs.pop(key, None))
+        return future
+
+
+def _prune_exports(keep: int = KEEP_FILES) -> None:
+    files = sorted(glob.glob(os.path.join(EXPORT_DIR, "*.pdf")), key=os.path.getmtime, reverse=True)
+    for path in files[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
 
 
 def generate_pdf_from_log(interaction_log) -> str:
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmpfile:
-        pdf_path = tmpfile.name
-        c = canvas.Canvas(pdf_path, pagesize=letter)
-        c.setFont("Helvetica", 12)
-        c.drawString(100, 750, "Legal Laws Assistant - Chat History")
-        y_position = 720
-        for _, row in interaction_log.iterrows():
-            user_query = row["user_query"]
-            assistant_response = row["assistant_response"]
-            c.drawString(80, y_position, f"👤 User: {user_query}")
-            y_position -= 20
-            c.drawString(100, y_position, f"🤖 Assistant: {assistant_response}")
-            y_position -= 30
-            if y_position < 50:
-                c.showPage()
-                c.setFont("Helvetica", 12)
-                y_position = 750
-        c.save()
-        return pdf_path
+    """Write the history to a PDF file and return its path; only the newest exports are kept."""
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    fd, pdf_path = tempfile.mkstemp(suffix=".pdf", dir=EXPORT_DIR)
+    with os.fdopen(fd, "wb") as f:
+        f.write(render_pdf(interaction_log))
+    _prune_exports()
+    return pdf_path
 
 
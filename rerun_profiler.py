@@ -0,0 +1,67 @@
+"""Time spent per section of a Streamlit rerun.
+
+Enable with ``PROFILE_RERUNS=1``. Each ``section`` is timed on every full
+rerun and every fragment rerun; the most recent samples are kept per section
+for the whole process so the sidebar can show typical (p50/p95) costs.
+"""
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+
+_samples = defaultdict(lambda: deque(maxlen=200))
+_samples_lock = threading.Lock()
+
+
+def enabled() -> bool:
+    return os.environ.get("PROFILE_RERUNS", "0") != "0"
+
+
+def _percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class RerunProfiler:
+    """Collects the section timings of one script run."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sections = {}
+
+    @contextmanager
+    def section(self, name: str):
+        if not enabled():
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        self.sections[name] = self.sections.get(name, 0.0) + seconds
+        with _samples_lock:
+            _samples[name].append(seconds)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+
+def summary() -> list:
+    """``{"section", "runs", "p50_ms", "p95_ms", "max_ms"}`` per section over recent reruns."""
+    with _samples_lock:
+        samples = {name: list(values) for name, values in _samples.items()}
+    return [
+        {
+            "section": name,
+            "runs": len(values),
+            "p50_ms": round(_percentile(values, 0.5) * 1000, 2),
+            "p95_ms": round(_percentile(values, 0.95) * 1000, 2),
+            "max_ms": round(max(values) * 1000, 2),
+        }
+        for name, values in samples.items()
+    ]
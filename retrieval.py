@@ -0,0 +1,188 @@
+"""Compact BM25 retrieval over local statute texts.
+
+Build the index offline from a folder of ``.txt``/``.md`` files::
+
+    python retrieval.py build statutes/ --out statute_index
+
+The index directory holds ``meta.json`` (vocabulary and BM25 settings),
+``postings.bin`` (per-term doc ids followed by precomputed BM25 term
+weights) and ``passages.bin``/``passages.idx`` (passage text and offsets).
+The binary files are memory-mapped, so a query only touches the postings of
+its own terms.
+"""
+import argparse
+import json
+import math
+import mmap
+import os
+import threading
+import unicodedata
+from array import array
+from collections import Counter
+from heapq import nlargest
+
+
+DEFAULT_INDEX_DIR = "statute_index"
+PASSAGE_WORDS = 150
+MIN_IDF = 0.2
+
+STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from how i if in is it of on or the to under "
+    "what when where which who why will with my me we you your".split()
+)
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def tokenize(text: str) -> list:
+    """Casefolded word tokens; keeps Indic vowel signs attached to their letters."""
+    chars = [
+        " " if unicodedata.category(ch)[0] in "PSZC" else ch
+        for ch in unicodedata.normalize("NFC", text).casefold()
+    ]
+    return [t for t in "".join(chars).split() if t not in STOPWORDS]
+
+
+def split_passages(text: str, max_words: int = PASSAGE_WORDS) -> list:
+    """Group blank-line separated paragraphs into passages of about ``max_words`` words."""
+    passages, current, words = [], [], 0
+    for para in (p.strip() for p in text.split("\n\n")):
+        if not para:
+            continue
+        n = len(para.split())
+        if current and words + n > max_words:
+            passages.append("\n".join(current))
+            current, words = [], 0
+        current.append(para)
+        words += n
+    if current:
+        passages.append("\n".join(current))
+    return passages
+
+
+def build_index(source_dir: str, out_dir: str = DEFAULT_INDEX_DIR, k1: float = 1.2, b: float = 0.75) -> int:
+    """Index every text file under ``source_dir`` into ``out_dir``; returns the passage count."""
+    passages, doc_terms = [], []
+    for root, _, files in os.walk(source_dir):
+        for name in sorted(files):
+            if not name.endswith((".txt", ".md")):
+                continue
+            with open(os.path.join(root, name), encoding="utf-8") as f:
+                text = f.read()
+            title = os.path.splitext(name)[0]
+            for passage in split_passages(text):
+                passages.append(f"{title}\t{passage}")
+                doc_terms.append(Counter(tokenize(passage)))
+
+    n_docs = len(passages)
+    avgdl = sum(sum(c.values()) for c in doc_terms) / n_docs if n_docs else 0.0
+    postings = {}
+    for doc_id, terms in enumerate(doc_terms):
+        dl = sum(terms.values())
+        norm = k1 * (1 - b + b * dl / avgdl) if avgdl else k1
+        for term, tf in terms.items():
+            postings.setdefault(term, []).append((doc_id, tf * (k1 + 1) / (tf + norm)))
+
+    os.makedirs(out_dir, exist_ok=True)
+    vocab, offset = {}, 0
+    with open(os.path.join(out_dir, "postings.bin"), "wb") as f:
+        for term in sorted(postings):
+            entries = postings[term]
+            array("I", (d for d, _ in entries)).tofile(f)
+            array("f", (w for _, w in entries)).tofile(f)
+            df = len(entries)
+            vocab[term] = [offset, df, math.log(1 + (n_docs - df + 0.5) / (df + 0.5))]
+            offset += 2 * df
+    offsets = array("Q", [0])
+    with open(os.path.join(out_dir, "passages.bin"), "wb") as f:
+        for passage in passages:
+            offsets.append(offsets[-1] + f.write(passage.encode("utf-8")))
+    with open(os.path.join(out_dir, "passages.idx"), "wb") as f:
+        offsets.tofile(f)
+    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"version": 1, "n_docs": n_docs, "avgdl": avgdl, "k1": k1, "b": b, "vocab": vocab}, f, ensure_ascii=False)
+    return n_docs
+
+
+def _map(path: str):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(b"")
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+class StatuteIndex:
+    """Read-only, memory-mapped view of an index written by :func:`build_index`."""
+
+    def __init__(self, index_dir: str = DEFAULT_INDEX_DIR):
+        with open(os.path.join(index_dir, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.vocab = meta["vocab"]
+        self.n_docs = meta["n_docs"]
+        postings = _map(os.path.join(index_dir, "postings.bin"))
+        self._ids = postings.cast("I")
+        self._weights = postings.cast("f")
+        self._offsets = _map(os.path.join(index_dir, "passages.idx")).cast("Q")
+        self._passages = _map(os.path.join(index_dir, "passages.bin"))
+
+    def passage(self, doc_id: int) -> tuple:
+        raw = bytes(self._passages[self._offsets[doc_id]:self._offsets[doc_id + 1]]).decode("utf-8")
+        title, _, text = raw.partition("\t")
+        return title, text
+
+    def search(self, query: str, k: int = 3) -> list:
+        """Return up to ``k`` ``(score, title, text)`` tuples, best first."""
+        scores = {}
+        entries = [self.vocab[t] for t in set(tokenize(query)) if t in self.vocab]
+        # Terms present in almost every passage barely move the ranking but
+        # dominate the work, so drop them unless nothing else matched
+        selective = [e for e in entries if e[2] >= MIN_IDF]
+        for offset, df, idf in selective or entries:
+            ids = self._ids[offset:offset + df]
+            weights = self._weights[offset + df:offset + 2 * df]
+            for doc_id, weight in zip(ids, weights):
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * weight
+        best = nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(score, *self.passage(doc_id)) for doc_id, score in best]
+
+
+def get_index() -> StatuteIndex | None:
+    """Return the shared index from ``STATUTE_INDEX``, or None when it has not been built."""
+    global _index
+    if _index is None:
+        index_dir = os.environ.get("STATUTE_INDEX", DEFAULT_INDEX_DIR)
+        if not os.path.exists(os.path.join(index_dir, "meta.json")):
+            return None
+        with _index_lock:
+            if _index is None:
+                _index = StatuteIndex(index_dir)
+    return _index
+
+
+def retrieve(query: str, k: int | None = None, max_chars: int = 800) -> list:
+    """Top passages for ``query`` formatted for the prompt; empty without an index."""
+    index = get_index()
+    if index is None:
+        return []
+    k = k if k is not None else int(os.environ.get("STATUTE_TOP_K", "3"))
+    return [f"[{title}] {text[:max_chars]}" for _, title, text in index.search(query, k)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or query the statute retrieval index.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="index a folder of statute text files")
+    build.add_argument("source")
+    build.add_argument("--out", default=DEFAULT_INDEX_DIR)
+    query = sub.add_parser("query", help="print the top passages for a question")
+    query.add_argument("text")
+    query.add_argument("--index", default=DEFAULT_INDEX_DIR)
+    query.add_argument("-k", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        print(f"Indexed {build_index(args.source, args.out)} passages into {args.out}")
+    else:
+        for score, title, text in StatuteIndex(args.index).search(args.text, args.k):
+            print(f"{score:.2f}  [{title}] {text[:200]}")
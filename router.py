@@ -0,0 +1,139 @@
+import os
+import threading
+import time
+
+import requests
+
+import health
+import llm_client
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+class Backend:
+    """One Ollama host (optionally with its own model) and its live load."""
+
+    def __init__(self, url: str, model: str | None = None):
+        self.url = url.rstrip("/")
+        self.model = model or llm_client.ollama_model()
+        self.outstanding = 0
+        self.latency = 0.0  # moving average of answer time in seconds
+
+    @property
+    def monitor(self) -> health.OllamaMonitor:
+        return health.get_monitor(self.url, self.model)
+
+    def available(self) -> bool:
+        return self.monitor.allow_request()
+
+
+def parse_hosts(spec: str) -> list:
+    """Parse ``OLLAMA_HOSTS``: comma-separated ``url`` or ``url=model`` entries."""
+    backends = []
+    for entry in (e.strip() for e in spec.split(",")):
+        if entry:
+            url, _, model = entry.partition("=")
+            backends.append(Backend(url.strip(), model.strip() or None))
+    return backends
+
+
+class Router:
+    """Send each request to the available host with the fewest outstanding requests.
+
+    Ties go to the host with the lowest recent latency. Hosts whose health
+    monitor has opened its circuit are skipped until it closes again, and a
+    failed request is retried on another host as long as nothing has been
+    streamed to the user yet.
+    """
+
+    def __init__(self, backends: list, attempts: int | None = None):
+        self.backends = backends
+        self.attempts = attempts or int(os.environ.get("OLLAMA_ATTEMPTS", str(min(len(backends), 3))))
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        return any(b.available() for b in self.backends)
+
+    def _pick(self, exclude: list, model: str | None = None, avoid_model: str | None = None) -> Backend | None:
+        with self._lock:
+            candidates = [b for b in self.backends if b not in exclude and b.available()]
+            if not candidates:
+                return None
+            # Prefer hosts configured for the requested model (e.g. small model on CPU boxes)
+            candidates = [b for b in candidates if b.model == model] or candidates
+            if avoid_model is not None:
+                candidates = [b for b in candidates if b.model != avoid_model] or candidates
+            best = min(candidates, key=lambda b: (b.outstanding, b.latency))
+            best.outstanding += 1
+            return best
+
+    def _release(self, backend: Backend, elapsed: float | None) -> None:
+        with self._lock:
+            backend.outstanding -= 1
+            if elapsed is not None:
+                backend.latency = elapsed if not backend.latency else 0.7 * backend.latency + 0.3 * elapsed
+
+    def generate(self, messages: list, on_token=None, stats: dict | None = None, model: str | None = None,
+                 options: dict | None = None, avoid_model: str | None = None) -> str | None:
+        """Like :func:`llm_client.generate`, routed and retried across the configured hosts.
+
+        ``model`` overrides the hosts' own model; hosts configured for it are preferred.
+        Without one, hosts whose own model is ``avoid_model`` are used only as a last
+        resort, and then asked for ``OLLAMA_MODEL`` instead.
+        """
+        tried, last_error = [], None
+        for _ in range(self.attempts):
+            backend = self._pick(tried, model, avoid_model)
+            if backend is None:
+                break
+            tried.append(backend)
+            run_model = model or backend.model
+            if model is None and avoid_model is not None and backend.model == avoid_model:
+                run_model = llm_client.ollama_model()
+            streamed = False
+
+            def relay(text):
+                nonlocal streamed
+                streamed = True
+                on_token(text)
+
+            start, elapsed = time.perf_counter(), None
+            try:
+                reply = llm_client.generate(
+                    messages, on_token=relay if on_token else None, stats=stats,
+                    host=backend.url, model=run_model, options=options,
+                )
+                elapsed = time.perf_counter() - start
+            except (llm_client.OllamaError, requests.RequestException) as e:
+                # A 4xx for a model the host was not configured with (e.g. an unpulled fast
+                # model) says nothing about the host itself, so it must not open its circuit
+                status = getattr(e, "status", None)
+                if not (status and 400 <= status < 500 and run_model != backend.model):
+                    backend.monitor.record_failure(str(e))
+                last_error = e
+                if streamed:
+                    raise
+                continue
+            finally:
+                self._release(backend, elapsed)
+            backend.monitor.record_success()
+            if stats is not None:
+                stats["host"], stats["model"] = backend.url, run_model
+            return reply
+        raise last_error or llm_client.OllamaError(
+            "Local LLM (Ollama) not available. Install from ollama.com and run: ollama run llama3.2"
+        )
+
+    def status(self) -> list:
+        return [(b.url, b.model, b.monitor.status(), b.outstanding) for b in self.backends]
+
+
+def get_router() -> Router:
+    """Return the process-wide router for ``OLLAMA_HOSTS`` (or the single ``OLLAMA_HOST``)."""
+    global _router
+    with _router_lock:
+        if _router is None:
+            _router = Router(parse_hosts(os.environ.get("OLLAMA_HOSTS") or llm_client.ollama_host()))
+        return _router
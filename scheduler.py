@@ -0,0 +1,159 @@
+import itertools
+import os
+import threading
+import time
+from collections import deque
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+class SchedulerBusy(Exception):
+    """Raised when the wait queue is full; the caller should ask the user to retry."""
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.cancelled = False  # the leader was interrupted before producing a result
+        self.waiters = 0
+
+
+def _percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+def default_max_in_flight() -> int:
+    """``LLM_MAX_IN_FLIGHT``, or else ``LLM_MAX_IN_FLIGHT_PER_HOST`` (default 2) per configured Ollama host."""
+    if os.environ.get("LLM_MAX_IN_FLIGHT"):
+        return int(os.environ["LLM_MAX_IN_FLIGHT"])
+    import router
+    return int(os.environ.get("LLM_MAX_IN_FLIGHT_PER_HOST", "2")) * len(router.get_router().backends)
+
+
+class LLMScheduler:
+    """Process-wide gate in front of the LLM backend.
+
+    At most ``max_in_flight`` generations run at once; further requests wait
+    in FIFO order, up to ``max_waiting`` of them, after which
+    :class:`SchedulerBusy` is raised. Requests with the same key while one is
+    already queued or running share its result instead of generating again.
+    """
+
+    def __init__(self, max_in_flight: int | None = None, max_waiting: int | None = None):
+        self.max_in_flight = max_in_flight or default_max_in_flight()
+        self.max_waiting = max_waiting if max_waiting is not None else int(os.environ.get("LLM_MAX_QUEUE", "32"))
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self._tickets = itertools.count()
+        self._in_flight = 0
+        self._flights = {}
+        self._waits = deque(maxlen=500)
+        self._counters = {"submitted": 0, "deduplicated": 0, "rejected": 0, "completed": 0, "failed": 0, "max_queue_depth": 0}
+
+    def run(self, key, fn, on_queued=None):
+        """Return ``fn()``, run under the concurrency cap and shared by identical ``key``s.
+
+        ``on_queued(position)`` is called whenever this request's place in the
+        wait queue changes (1 = next to run).
+        """
+        leader = False
+        with self._cond:
+            self._counters["submitted"] += 1
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.waiters += 1
+                self._counters["deduplicated"] += 1
+            else:
+                if len(self._queue) >= self.max_waiting and self._in_flight >= self.max_in_flight:
+                    self._counters["rejected"] += 1
+                    raise SchedulerBusy("The assistant is busy. Please try again in a moment.")
+                flight = self._flights[key] = _Flight()
+                ticket = next(self._tickets)
+                self._queue.append(ticket)
+                self._counters["max_queue_depth"] = max(self._counters["max_queue_depth"], len(self._queue))
+                leader = True
+        if not leader:
+            flight.done.wait()
+            if flight.cancelled:
+                # The leader's session went away (e.g. a Streamlit rerun); ask again, one follower leads
+                return self.run(key, fn, on_queued)
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            self._acquire(ticket, on_queued)
+        except BaseException:
+            # Cancelled while waiting (e.g. the page was rerun); give up the place in line
+            with self._cond:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                self._flights.pop(key, None)
+                self._counters["failed"] += 1
+                self._cond.notify_all()
+            flight.cancelled = True
+            flight.done.set()
+            raise
+        try:
+            flight.result = fn()
+            return flight.result
+        except Exception as e:
+            flight.error = e
+            raise
+        except BaseException:
+            # Streamlit's StopException/RerunException are not Exceptions
+            flight.cancelled = True
+            raise
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._flights.pop(key, None)
+                self._counters["failed" if flight.error or flight.cancelled else "completed"] += 1
+                self._cond.notify_all()
+            flight.done.set()
+
+    def _acquire(self, ticket: int, on_queued) -> None:
+        enqueued = time.perf_counter()
+        reported = None
+        while True:
+            with self._cond:
+                position = self._queue.index(ticket)
+                if position == 0 and self._in_flight < self.max_in_flight:
+                    self._queue.popleft()
+                    self._in_flight += 1
+                    self._waits.append(time.perf_counter() - enqueued)
+                    self._cond.notify_all()
+                    return
+                if on_queued is None or position + 1 == reported:
+                    self._cond.wait(1.0)
+                    continue
+            reported = position + 1
+            on_queued(reported)
+
+    def metrics(self) -> dict:
+        with self._cond:
+            waits = list(self._waits)
+            return dict(
+                self._counters,
+                queue_depth=len(self._queue),
+                in_flight=self._in_flight,
+                wait_p50=_percentile(waits, 50),
+                wait_p95=_percentile(waits, 95),
+                wait_max=max(waits, default=0.0),
+            )
+
+
+def get_scheduler() -> LLMScheduler:
+    """Return the scheduler shared by every session in this process."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler()
+        return _scheduler
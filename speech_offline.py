@@ -0,0 +1,167 @@
+"""Offline, streaming speech recognition on CPU with Vosk.
+
+Audio is consumed as 16 kHz mono 16-bit PCM frames, from the microphone or a
+WAV file. An energy-based voice-activity detector, calibrated against the
+background noise once and then reused, decides when speech has ended so the
+query can be sent without waiting for a fixed timeout. Partial transcripts
+are reported while the user is still speaking.
+
+Download a model from https://alphacephei.com/vosk/models and point
+``VOSK_MODEL_PATH`` at it. To benchmark without a microphone::
+
+    python speech_offline.py question.wav
+"""
+import json
+import math
+import os
+import sys
+import threading
+import time
+import wave
+from array import array
+
+
+SAMPLE_RATE = 16000
+FRAME_MS = 30
+FRAME_BYTES = SAMPLE_RATE * FRAME_MS // 1000 * 2
+
+_model = None
+_model_lock = threading.Lock()
+# Background noise level (RMS) and when it was measured, shared by all sessions
+_noise_floor = None
+_noise_measured = 0.0
+
+
+class OfflineASRUnavailable(Exception):
+    """Raised when Vosk or its model is not installed."""
+
+
+def frame_rms(frame: bytes) -> float:
+    samples = array("h", frame[: len(frame) - len(frame) % 2])
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+def calibrate(frames: list) -> float:
+    """Record the noise floor from ``frames`` of background audio and return it."""
+    global _noise_floor, _noise_measured
+    levels = sorted(frame_rms(f) for f in frames) or [0.0]
+    _noise_floor = levels[len(levels) // 2]
+    _noise_measured = time.monotonic()
+    return _noise_floor
+
+
+def noise_floor(max_age: float | None = None) -> float | None:
+    """The cached noise floor, or None when it was never measured or is older than ``max_age``."""
+    max_age = max_age if max_age is not None else float(os.environ.get("VAD_CALIBRATION_TTL", "600"))
+    if _noise_floor is None or time.monotonic() - _noise_measured > max_age:
+        return None
+    return _noise_floor
+
+
+def get_model():
+    """Load the Vosk model once per process."""
+    global _model
+    with _model_lock:
+        if _model is None:
+            try:
+                from vosk import Model, SetLogLevel
+            except ImportError as e:
+                raise OfflineASRUnavailable("Offline speech recognition needs the 'vosk' package.") from e
+            path = os.environ.get("VOSK_MODEL_PATH", "models/vosk")
+            if not os.path.isdir(path):
+                raise OfflineASRUnavailable(f"Vosk model not found at {path}. Set VOSK_MODEL_PATH.")
+            SetLogLevel(-1)
+            _model = Model(path)
+        return _model
+
+
+class OfflineRecognizer:
+    """Turn a stream of PCM frames into text, stopping when speech ends."""
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, end_silence: float = 0.7, max_seconds: float = 15.0,
+                 sensitivity: float = 3.0):
+        self.sample_rate = sample_rate
+        self.end_silence = end_silence
+        self.max_seconds = max_seconds
+        self.sensitivity = sensitivity
+
+    def transcribe(self, frames, on_partial=None) -> str:
+        """Recognize ``frames`` (an iterable of PCM byte chunks) and return the final transcript.
+
+        The first half second is used to calibrate the noise floor when no
+        recent calibration is cached. ``on_partial`` receives the partial
+        transcript whenever it changes.
+        """
+        model = get_model()
+        from vosk import KaldiRecognizer
+
+        recognizer = KaldiRecognizer(model, self.sample_rate)
+        frame_seconds = FRAME_MS / 1000
+        calibration, threshold = [], None
+        floor = noise_floor()
+        if floor is not None:
+            threshold = max(floor * self.sensitivity, 300.0)
+        heard_speech, silence, elapsed, last_partial = False, 0.0, 0.0, ""
+        segments = []
+
+        for frame in frames:
+            elapsed += frame_seconds
+            if threshold is None:
+                calibration.append(frame)
+                if len(calibration) * frame_seconds >= 0.5:
+                    threshold = max(calibrate(calibration) * self.sensitivity, 300.0)
+            elif frame_rms(frame) >= threshold:
+                heard_speech, silence = True, 0.0
+            elif heard_speech:
+                silence += frame_seconds
+
+            if recognizer.AcceptWaveform(frame):
+                text = json.loads(recognizer.Result()).get("text", "")
+                if text:
+                    segments.append(text)
+            else:
+                partial = " ".join(segments + [json.loads(recognizer.PartialResult()).get("partial", "")]).strip()
+                if partial and partial != last_partial and on_partial:
+                    on_partial(partial)
+                    last_partial = partial
+
+            if (heard_speech and silence >= self.end_silence) or elapsed >= self.max_seconds:
+                break
+        segments.append(json.loads(recognizer.FinalResult()).get("text", ""))
+        return " ".join(segments).strip()
+
+
+def wav_frames(path: str):
+    """Yield 30 ms PCM frames from a 16 kHz mono 16-bit WAV file."""
+    with wave.open(path, "rb") as wav:
+        if wav.getnchannels() != 1 or wav.getsampwidth() != 2 or wav.getframerate() != SAMPLE_RATE:
+            raise ValueError("Expected a 16 kHz mono 16-bit WAV file")
+        while True:
+            frame = wav.readframes(FRAME_BYTES // 2)
+            if not frame:
+                return
+            yield frame
+
+
+def microphone_frames():
+    """Yield 30 ms PCM frames from the default microphone until the consumer stops."""
+    import speech_recognition as sr
+    with sr.Microphone(sample_rate=SAMPLE_RATE, chunk_size=FRAME_BYTES // 2) as source:
+        while True:
+            yield source.stream.read(source.CHUNK)
+
+
+def transcribe_file(path: str, on_partial=None) -> str:
+    return OfflineRecognizer().transcribe(wav_frames(path), on_partial=on_partial)
+
+
+if __name__ == "__main__":
+    for wav_path in sys.argv[1:]:
+        with wave.open(wav_path, "rb") as w:
+            audio_seconds = w.getnframes() / w.getframerate()
+        start = time.perf_counter()
+        text = transcribe_file(wav_path, on_partial=lambda p: print(f"  ... {p}"))
+        took = time.perf_counter() - start
+        print(f"{wav_path}: {text!r} ({took:.2f}s for {audio_seconds:.2f}s of audio, RTF {took / audio_seconds:.2f})")
@@ -0,0 +1,98 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+DEFAULT_FOLDER = "templates"
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+class TemplateRegistry:
+    """Shared, cached view of the files in a templates folder.
+
+    The folder is scanned once; afterwards the files are only re-stat'ed
+    every ``check_interval`` seconds and re-read when their size or mtime
+    changed. File contents live in one LRU cache bounded by
+    ``max_bytes`` and the same bytes object is handed to every session and to
+    the email sender, so no caller re-reads or copies a template.
+    """
+
+    def __init__(self, folder: str = DEFAULT_FOLDER, check_interval: float = 5.0, max_bytes: int | None = None):
+        self.folder = folder
+        self.check_interval = check_interval
+        self.max_bytes = max_bytes or int(os.environ.get("TEMPLATE_CACHE_BYTES", str(64 * 1024 * 1024)))
+        self._files = {}  # name -> (mtime_ns, size)
+        self._data = OrderedDict()  # name -> bytes
+        self._data_bytes = 0
+        self._checked = 0.0
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if now - self._checked < self.check_interval:
+            return
+        self._checked = now
+        try:
+            entries = {e.name: e.stat() for e in os.scandir(self.folder) if e.is_file()}
+        except FileNotFoundError:
+            entries = {}
+        files = {}
+        for name, st in entries.items():
+            files[name] = (st.st_mtime_ns, st.st_size)
+            if self._files.get(name) != files[name]:
+                self._drop(name)
+        for name in set(self._files) - set(files):
+            self._drop(name)
+        self._files = files
+
+    def _drop(self, name: str) -> None:
+        data = self._data.pop(name, None)
+        if data is not None:
+            self._data_bytes -= len(data)
+
+    def documents(self, suffix: str = ".pdf") -> list:
+        with self._lock:
+            self._refresh()
+            return sorted(name for name in self._files if name.endswith(suffix))
+
+    def data(self, name: str) -> bytes | None:
+        """File contents, read from disk only when not cached or changed."""
+        with self._lock:
+            self._refresh()
+            if name not in self._files:
+                return None
+            data = self._data.get(name)
+            if data is not None:
+                self._data.move_to_end(name)
+                return data
+            with open(os.path.join(self.folder, name), "rb") as f:
+                data = f.read()
+            self._data[name] = data
+            self._data_bytes += len(data)
+            while self._data_bytes > self.max_bytes and len(self._data) > 1:
+                _, evicted = self._data.popitem(last=False)
+                self._data_bytes -= len(evicted)
+            return data
+
+
+def get_registry(folder: str = DEFAULT_FOLDER) -> TemplateRegistry:
+    """Return the process-wide registry for ``folder``."""
+    key = os.path.abspath(folder)
+    with _registries_lock:
+        if key not in _registries:
+            _registries[key] = TemplateRegistry(folder)
+        return _registries[key]
+
+
+def read_file(path: str) -> bytes:
+    """Bytes of ``path``, served from the registry when it lives in a registered folder."""
+    folder, name = os.path.split(os.path.abspath(path))
+    registry = _registries.get(folder)
+    data = registry.data(name) if registry else None
+    if data is None:
+        with open(path, "rb") as f:
+            data = f.read()
+    return data
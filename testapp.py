@@ -1,21 +1,31 @@
 import streamlit as st
 st.set_page_config(page_title="Legal Assistant", layout="wide")
+import rerun_profiler
+# Started before the imports so the full-rerun total includes them
+profile = rerun_profiler.RerunProfiler()
 import threading
-import pandas as pd
+import hashlib
 import json
 import os
-from voice import speak, listen, listen_for_stop
-from pdf_export import generate_pdf_from_log
-from email_service import send_email
-import requests
+import secrets
+import time
+from concurrent.futures import wait
+from template_registry import get_registry
+import llm_client
+import answer_cache
+import assistant
+import metrics
+import router
+import scheduler
+from conversation import ConversationMemory
+from interaction_store import InteractionLog
+from app_content import BUTTON_CSS, LANGUAGES, legal_templates, translations
 
 # Initialize session state attributes if not already set
 if "messages" not in st.session_state:
     st.session_state.messages = []
-if "conversation_context" not in st.session_state:
-    st.session_state.conversation_context = []
-if "interaction_log" not in st.session_state:
-    st.session_state.interaction_log = pd.DataFrame(columns=["user_query", "assistant_response"])
+if "conversation" not in st.session_state:
+    st.session_state.conversation = ConversationMemory()
 
 # Ensure language_preference and user_logged_in are initialized
 if "language_preference" not in st.session_state:
@@ -29,238 +39,387 @@ if "use_llm" not in st.session_state:
 if "use_voice" not in st.session_state:
     st.session_state.use_voice = False
 
-# Voice functions are imported from voice.py
+def _history_key() -> str:
+    """Server-issued random key this browser's history is stored under.
+
+    Names typed at login are neither unique nor secret, so they do not
+    identify a history. The key is kept in the page URL (``?hid=``), which
+    brings the same history back after a reload or from a bookmark; only
+    its hash is stored.
+    """
+    key = st.session_state.get("history_key")
+    if key is None:
+        key = st.query_params.get("hid") or ""
+        if len(key) < 32:
+            key = secrets.token_urlsafe(32)
+        st.session_state.history_key = key
+    if st.query_params.get("hid") != key:
+        st.query_params["hid"] = key
+    return key
+
+
+def _interaction_log() -> InteractionLog:
+    """This browser's persistent history (see :func:`_history_key`)."""
+    user = hashlib.sha256(_history_key().encode("utf-8")).hexdigest()
+    log = st.session_state.get("interaction_log")
+    if log is None or log.user != user:
+        log = st.session_state.interaction_log = InteractionLog(user)
+    return log
+
+# Voice, PDF and email stacks are imported where first used: voice.py (pyttsx3,
+# speech_recognition), pdf_export.py (reportlab) and email_outbox.py (smtplib).
+# Python caches each module, so every session shares the one loaded copy.
 
 # Patterns loader is imported from patterns.py
 
 # No pattern loading: fully LLM-driven
 
 # Define response function based on patterns
-def get_response(query):
+def get_response(query, on_token=None):
+    """Answer ``query`` via the shared pipeline in assistant.py, reporting problems on the page.
+
+    Pass ``on_token`` to stream the answer; it receives the text generated so far.
+    """
     query = query.strip()
-    if len(query) < 3:
-        return translations.get(st.session_state.language_preference, translations["English"]).get("no_response", "No response.")
+    no_response = translations.get(st.session_state.language_preference, translations["English"]).get("no_response", "No response.")
+    if len(query) < 3 or not st.session_state.use_llm:
+        return no_response
 
-    st.session_state.conversation_context.append(f"User: {query}")
+    queue_note = st.empty()
+    stats = {}
+    try:
+        llm_reply = assistant.answer(
+            query, st.session_state.language_preference, st.session_state.conversation,
+            on_token=on_token, stats=stats,
+            on_queued=lambda position: queue_note.info(f"⏳ Waiting for the assistant (position {position} in queue)"),
+        )
+    except scheduler.SchedulerBusy as e:
+        st.warning(str(e))
+        return no_response
+    except llm_client.OllamaError as e:
+        st.info(str(e))
+        return no_response
+    except Exception:
+        st.info(assistant.NOT_AVAILABLE)
+        return no_response
+    finally:
+        queue_note.empty()
+    if llm_reply and stats:
+        st.session_state.last_generation_stats = stats
+    return llm_reply or no_response
 
-    llm_reply = generate_llm_response(query)
-    if llm_reply:
-        st.session_state.conversation_context.append(f"Assistant: {llm_reply}")
-        return llm_reply
-    return translations.get(st.session_state.language_preference, translations["English"]).get("no_response", "No response.")
+def _stream_enabled() -> bool:
+    return os.environ.get("OLLAMA_STREAM", "1") != "0"
 
-def generate_llm_response(query):
-    """Generate a response using a local LLM via Ollama (no API key required)."""
-    if not st.session_state.use_llm:
-        return None
+def _show_response(label, query, on_text=None):
+    """Render the answer progressively under ``label`` and return the full text.
 
-    # Try local Ollama if running (no API key needed)
-    try:
-        ollama_host = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
-        ollama_model = os.environ.get("OLLAMA_MODEL", "llama3.2:1b")
-        sys_msg = "You provide non-advisory legal information for India. Keep answers concise with a brief disclaimer."
-        # Prefer native Ollama chat API
-        chat_payload = {
-            "model": ollama_model,
-            "messages": [
-                {"role": "system", "content": sys_msg},
-                {"role": "user", "content": f"User question: {query}"},
-            ],
-            "stream": False,
-        }
-        r = requests.post(f"{ollama_host}/api/chat", json=chat_payload, timeout=120)
-        if r.status_code == 200:
-            data = r.json()
-            msg = (data.get("message") or {}).get("content")
-            if msg:
-                return msg.strip()
+    ``on_text`` also receives the partial answer as it streams (e.g. for speech).
+    """
+    placeholder = st.empty()
+    # Only the newest answer's stats are kept; cleared so a failed answer shows no stale timings
+    st.session_state.last_generation_stats = None
+    render = 0.0
+
+    def on_token(text):
+        nonlocal render
+        start = time.perf_counter()
+        placeholder.write(f"{label}: {text}")
+        render += time.perf_counter() - start
+        if on_text:
+            on_text(text)
+
+    response = get_response(query, on_token=on_token if _stream_enabled() else None)
+    start = time.perf_counter()
+    placeholder.write(f"{label}: {response}")
+    # Time spent drawing the answer, streamed chunks included
+    metrics.observe("render", render + time.perf_counter() - start)
+    stats = st.session_state.last_generation_stats
+    if stats and stats.get("ttft") is not None:
+        st.caption(f"⏱️ First token {stats['ttft']:.2f}s · total {stats['total']:.2f}s")
+    return response
+
+
+# Folder where templates are stored
+TEMPLATES_FOLDER = "templates"
+
+# Panels below are fragments: a click inside one reruns only that panel, not the whole page.
+# Translations, templates and CSS come from app_content.py, built once per process.
+
+@st.fragment
+def chat_panel():
+    with profile.section("chat"):
+        lang = translations[st.session_state.language_preference]
+        st.write(f"👋 Hello {st.session_state.get('username', '')}! {lang['ask_query']}")
+        prompt = st.chat_input(lang["ask_query"])
+
+        if prompt:
+            st.write(f"👤 Your Query: {prompt}")
+            response = _show_response("🤖 Response", prompt)
+
+            _interaction_log().append(prompt, response)
+
+# Speech to Text Button
+@st.fragment
+def voice_panel():
+    with profile.section("voice"):
+        if st.button(translations[st.session_state.language_preference]["voice_query"]):
+            if not st.session_state.use_voice:
+                st.info("Voice is disabled. Enable it in the sidebar.")
+            else:
+                from voice import SentenceStream, listen
+                query = listen()
+                if query:
+                    st.session_state.messages.append(query)
+                    st.write(f"Your Query: {query}")
+                    # Speak each sentence as soon as it has streamed in
+                    speech = SentenceStream()
+                    response = _show_response("Assistant Response", query, on_text=speech.feed)
+                    speech.finish(response)
+
+                    _interaction_log().append(query, response)
+        if st.session_state.use_voice:
+            from voice import listen_for_stop, stop_speech
+            if st.button("🔇 Stop speaking"):
+                stop_speech()
+            if st.button("🎙️ Say \"stop\""):
+                listen_for_stop()
+
+# Interaction History Button
+@st.fragment
+def history_panel():
+    with profile.section("history"):
+        if st.button(translations[st.session_state.language_preference]["view_history"]):
+            # The browser is drawn full width below the buttons, so show or hide it with a full rerun
+            st.session_state.show_history = not st.session_state.get("show_history", False)
+            st.session_state.history_offset = 0
+            st.rerun(scope="app")
+
+HISTORY_PAGE_SIZE = 20
+
+# Paginated, searchable history; only the visible page is read from SQLite and sent to the browser
+@st.fragment
+def history_browser():
+    with profile.section("history"):
+        log = _interaction_log()
+        st.caption("Your history is saved under this page's link; keep the link private.")
+        search = st.text_input("🔎 Search your history", key="history_search").strip()
+        if search != st.session_state.get("history_last_search", ""):
+            st.session_state.history_last_search = search
+            st.session_state.history_offset = 0
+        offset = st.session_state.get("history_offset", 0)
+        if search:
+            rows, more = log.search(search, offset, HISTORY_PAGE_SIZE)
+            status = f"Matches {offset + 1 if rows else 0}–{offset + len(rows)}"
         else:
-            st.info(f"Ollama not ready (HTTP {r.status_code}). Ensure the model '{ollama_model}' is pulled: ollama run {ollama_model}")
-        # Fallback to OpenAI-compatible endpoint if available
-        compat_payload = {
-            "model": ollama_model,
-            "messages": [
-                {"role": "system", "content": sys_msg},
-                {"role": "user", "content": f"User question: {query}"},
+            total = len(log)
+            rows = log.page(offset, HISTORY_PAGE_SIZE)
+            more = offset + len(rows) < total
+            status = f"Showing {offset + 1 if rows else 0}–{offset + len(rows)} of {total}"
+        st.dataframe(
+            [
+                {"time": time.strftime("%Y-%m-%d %H:%M", time.localtime(ts)), "user_query": q, "assistant_response": a}
+                for _, ts, q, a in rows
             ],
-            "stream": False,
-        }
-        r2 = requests.post(f"{ollama_host}/v1/chat/completions", json=compat_payload, timeout=120)
-        if r2.status_code == 200:
-            data2 = r2.json()
-            msg2 = data2.get("choices", [{}])[0].get("message", {}).get("content")
-            if msg2:
-                return msg2.strip()
+            hide_index=True,
+            width="stretch",
+        )
+        newer, info, older = st.columns([1, 2, 1])
+        if newer.button("◀ Newer" if not search else "◀ Previous", disabled=offset == 0):
+            st.session_state.history_offset = max(0, offset - HISTORY_PAGE_SIZE)
+            st.rerun(scope="fragment")
+        info.caption(status)
+        if older.button("Older ▶" if not search else "Next ▶", disabled=not more):
+            st.session_state.history_offset = offset + HISTORY_PAGE_SIZE
+            st.rerun(scope="fragment")
+
+# Download Button for PDF
+@st.fragment
+def pdf_panel():
+    with profile.section("pdf"):
+        log = _interaction_log()
+        pdf_key = (log.user, log.version)
+        if st.button(translations[st.session_state.language_preference]["download_law"]):
+            from pdf_export import export_pdf_async
+            # Rendered in a background worker and cached until the log changes
+            st.session_state.pdf_job = (pdf_key, export_pdf_async(pdf_key, log.rows))
+        pdf_job = st.session_state.get("pdf_job")
+        if pdf_job and pdf_job[0] == pdf_key:
+            done, _ = wait([pdf_job[1]], timeout=0.5)
+            if done:
+                st.download_button(
+                    label="📄 Download Chat as PDF",
+                    data=pdf_job[1].result(),
+                    file_name="Chat_History.pdf",
+                    mime="application/pdf",
+                )
+            else:
+                pdf_pending(pdf_job[1])
+
+# Polls a PDF render still running in the background, then reruns the page once to offer the download
+@st.fragment(run_every=1.0)
+def pdf_pending(job):
+    if job.done():
+        st.rerun(scope="app")
+    st.info("Preparing the PDF in the background…")
+
+# Clear history / Export CSV
+@st.fragment
+def export_panel():
+    with profile.section("export"):
+        log = _interaction_log()
+        if st.button("Clear History"):
+            log.clear()
+            st.session_state.conversation.clear()
+            st.success("History cleared")
+        # The CSV is only built when the button is clicked
+        st.download_button(
+            label="⬇️ Export CSV",
+            data=log.to_csv,
+            file_name="interaction_history.csv",
+            mime="text/csv"
+        )
+
+@st.fragment
+def gmail_panel():
+    with profile.section("gmail"):
+        import email_service
+        from email_outbox import get_outbox
+        st.subheader("📧 Send Legal Documents via Email")
+        user_email = st.text_input("Enter your email:")
+        documents = get_registry(TEMPLATES_FOLDER).documents('.pdf')
+        selected_document = st.selectbox("Choose a document:", documents)
+
+        if st.button("Send Document"):
+            if not email_service.is_configured():
+                st.error("Email not configured. Set SMTP_USERNAME and SMTP_PASSWORD.")
+            elif user_email and selected_document:
+                document_path = os.path.join(TEMPLATES_FOLDER, selected_document)
+                # Delivered by the background outbox so the page does not wait on SMTP
+                message_id = get_outbox().enqueue(user_email, "Your Legal Document", "Please find the attached legal document.", document_path)
+                st.session_state.setdefault("sent_emails", []).append(message_id)
+            else:
+                st.warning("⚠️ Please enter an email and select a document.")
+
+        message_ids = st.session_state.get("sent_emails", [])[-5:]
+        if _delivery_status(message_ids, render=False):
+            delivery_status_live(message_ids)
         else:
-            st.info(f"Ollama compatibility endpoint not ready (HTTP {r2.status_code}). Try again after model download finishes.")
-    except Exception:
-        st.info("Local LLM (Ollama) not available. Install from ollama.com and run: ollama run llama3.2")
-
-    return None
-
-# Language Translation Dictionary
-translations = {
-    "English": {
-        "ask_query": "Ask your query for legal assistance",
-        "thinking": "Thinking ✨...",
-        "no_response": "Sorry, I couldn't find a matching response for your query.",
-        "positive_feedback": "👍 Positive feedback",
-        "negative_feedback": "👎 Negative feedback",
-        "login_button": "Login",
-        "welcome": "Welcome",
-        "faq_button": "Show FAQs",
-        "download_button": "Download",
-        "interaction_history": "Show Interaction History",
-        "voice_query": "Voice Query 🎙️",
-        "view_history": "View History 📜",
-        "download_law": "Download Law 📁 ",
-        "info_section": "**Legal Laws Assistance:📄**\n- **Objective:** Developed a conversational chatbot to provide legal laws info and assistance.\n- **Features:**📜\n  - Allows users to ask their query of law.\n  - Includes Mutlilingual, Voice query, Legal templates support.\n  - Provides a response to user query. ✔\n  - Offers a user-friendly interface for asking legal queries."
-    },
-    "Hindi - हिन्दी": {
-        "ask_query": "कानूनी सहायता के लिए अपना प्रश्न पूछें",
-        "thinking": "सोच रहे हैं ✨...",
-        "no_response": "मुझे आपके प्रश्न का मिलान करने वाला उत्तर नहीं मिला।",
-        "positive_feedback": "👍 सकारात्मक प्रतिक्रिया",
-        "negative_feedback": "👎 नकारात्मक प्रतिक्रिया",
-        "login_button": "लॉगिन करें",
-        "welcome": "स्वागत है",
-        "faq_button": "सामान्य प्रश्न दिखाएँ",
-        "download_button": "चैट इतिहास डाउनलोड करें",
-        "interaction_history": "इंटरएक्शन इतिहास दिखाएँ",
-        "voice_query": "आवाज़ से पूछें 🎙️",
-        "view_history": "इतिहास देखें 📜",
-        "download_law": "कानून डाउनलोड करें 📁",
-         "info_section": """
-        **कानूनी क़ानून सलाहकार बॉट📄**
-        - **लक्ष्य:** कानूनी क़ानून जानकारी और सहायता प्रदान करने के लिए एक संवादात्मक चैटबॉट विकसित किया गया।
-        - **विशेषताएँ:**📜
-          -  उपयोगकर्ताओं को कानून से संबंधित प्रश्न पूछने की अनुमति देता है। 𓍝
-          -  उपयोगकर्ता के प्रश्न का उत्तर प्रदान करता है। ✔
-          -  उपयोगकर्ता के प्रश्न का विस्तृत विवरण, दंड, लाभ, और हानियाँ प्रदर्शित करता है। ✉︎
-          -  कानूनी प्रश्न पूछने के लिए एक उपयोगकर्ता-मित्र इंटरफेस प्रदान करता है। 🔗
-        """
-    },
-    "Telugu - తెలుగు": {
-        "ask_query": "న్యాయ సహాయం కోసం మీ ప్రశ్నను అడగండి",
-        "thinking": "ఆలోచిస్తున్నాను ✨...",
-        "no_response": "మీ ప్రశ్నకు సరిపడే సమాధానం కనుగొనలేకపోయాను.",
-        "positive_feedback": "👍 సానుకూల అభిప్రాయం",
-        "negative_feedback": "👎 ప్రతికూల అభిప్రాయం",
-        "login_button": "లాగిన్ చేయండి",
-        "welcome": "స్వాగతం",
-        "faq_button": "ఎఫ్ ఏ క్యూ లను చూపించండి",
-        "download_button": "చాట్ చరిత్రను డౌన్‌లోడ్ చేయండి",
-        "interaction_history": "మాట్లాడిన చరిత్ర చూపించు",
-        "voice_query": "వాయిస్ క్వెరీ 🎙️",
-        "view_history": "చరిత్ర చూడండి 📜",
-        "download_law": "డౌన్‌లోడ్ చేయండి 📁",
-        "info_section": """
-        **చట్టాల సలహా బాట్📄**
-        - **ఉద్దేశం:** చట్టాల సమాచారం మరియు సహాయం అందించడానికి ఒక సంభాషణ చాట్‌బాట్‌ను అభివృద్ధి చేయడం।
-        - **ప్రతి పౌరుడు చట్టాల గురించి అవగాహన కలిగి ఉండాలి.
-        - **సదుపాయాలు:**📜
-          -  వినియోగదారులు చట్టం గురించి తమ ప్రశ్నను అడగగలుగుతారు। 𓍝
-          -  వినియోగదారుల ప్రశ్నకు సమాధానం అందిస్తుంది। ✔
-          -  వినియోగదారు ప్రశ్నకు సంబంధించిన వివరణ, శిక్షలు, లాభాలు మరియు నష్టాలను ప్రదర్శిస్తుంది। ✉︎
-          -  చట్టంపై ప్రశ్నలను అడగడానికి వినియోగదారు-అనుకూల ఇంటర్‌ఫేస్ అందిస్తుంది। 🔗
-        - **ప్రాముఖ్యత:** సంభాషణ కృత్రిమ నుణ్ణి గుణం ద్వారా చట్ట సమాచారాన్ని అందించే లోనిపడి సరళత, సామర్థ్యం మరియు యాక్సెస్‌పై దృష్టి సారిస్తుంది। 📝
-        """
-    },
-    "Tamil - தமிழ்": {
-        "ask_query":"சட்ட உதவிக்கு உங்கள் கேள்வியைக் கேளுங்கள்",
-        "thinking": "சிந்தித்து கொண்டிருக்கிறேன் ✨...",
-        "no_response": "உங்கள் கேள்விக்கான பதிலை காணவில்லை.",
-        "positive_feedback": "👍 நல்ல கருத்து",
-        "negative_feedback": "👎 எதிர்மறை கருத்து",
-        "login_button": "உள்நுழைய",
-        "welcome": "வரவேற்கிறேன்",
-        "faq_button": "கேள்விகளை காண்பிக்கவும்",
-        "download_button": "அரட்டை வரலாற்றைப் பதிவிறக்கவும்",
-        "interaction_history": "உரையாடல் வரலாற்றைக் காண்பிக்கவும்",
-        "voice_query": "குரல் கேள்வி 🎙️",
-        "view_history": "வரலாற்றைக் காண்க 📜",
-        "download_law": "சட்டத்தை பதிவிறக்கவும் 📁",
-        "info_section": """
-        **சட்ட ஆலோசகர்போட்📄**
-        - **நோக்கம்:** சட்ட தகவல்கள் மற்றும் உதவியை வழங்குவதற்காக உருவாக்கப்பட்ட ஒரு உரையாடல் சாட் பாட்டை உருவாக்கியது.
-        - **ஒவ்வொரு குடிமகனும் சட்டங்களைப் பற்றி அறிந்திருக்க வேண்டும்.**
-        - **சாதனைகள்:**📜
-          -  பயனாளர்களுக்கு சட்டம் பற்றிய கேள்விகளை கேட்க அனுமதிக்கின்றது। 𓍝
-          -  பயனாளரின் கேள்விக்கு பதில் அளிக்கின்றது। ✔
-          -  பயனாளரின் கேள்விக்கு தொடர்புடைய விளக்கம், தண்டனைகள், நன்மைகள் மற்றும் தீமைகளை காட்டுகின்றது। ✉︎
-          -  சட்டங்களைப் பற்றி கேட்க பயனாளர் நட்பான இடைமுகத்தை வழங்குகிறது। 🔗
-        - **முக்கியத்துவம்:** உரையாடல் செயற்கை நுண்ணறிவு வழியாக சட்ட தகவல்களை வழங்குவதில் எளிமை, திறன் மற்றும் அணுகுமுறை என்பதிலுள்ள கவனம். 📝
-        """
-    },
-    "Kannada - ಕನ್ನಡ": {
-    "ask_query": "ನಿಮ್ಮ ಕಾನೂನು ಸಹಾಯಕ್ಕಾಗಿ ಪ್ರಶ್ನೆಯನ್ನು ಕೇಳಿ",
-    "thinking": "ಆಲೋಚನೆ ✨...",
-    "no_response": "ಕ್ಷಮಿಸಿ, ನಿಮ್ಮ ಪ್ರಶ್ನೆಗೆ ಹೊಂದುವ ಉತ್ತರವನ್ನು ನಾನು ಕಂಡುಹಿಡಿಯಲಿಲ್ಲ.",
-    "positive_feedback": "👍 ಉತ್ತಮ ಪ್ರತಿಕ್ರಿಯೆ",
-    "negative_feedback": "👎 ಹೀನಾಯ ಪ್ರತಿಕ್ರಿಯೆ",
-    "login_button": "ಲಾಗಿನ್",
-    "welcome": "ಸ್ವಾಗತ",
-    "faq_button": "FAQಗಳನ್ನು ತೋರಿಸಿ",
-    "download_button": "ಚಾಟ್ ಇತಿಹಾಸವನ್ನು PDFಗೆ ಡೌನ್‌ಲೋಡ್ ಮಾಡಿ",
-    "interaction_history": "ಇಂಟರಾಕ್ಷನ್ ಇತಿಹಾಸವನ್ನು ತೋರಿಸಿ",
-    "voice_query": "ಧ್ವನಿ ಪ್ರಶ್ನೆ 🎙️",
-    "view_history": "ಇತಿಹಾಸ ವೀಕ್ಷಿಸಿ 📜",
-    "download_law": "ಕಾನೂನು ಡೌನ್‌ಲೋಡ್ ಮಾಡಿ 📁",
-    "info_section": "**ಕಾನೂನು ಸಲಹೆಗಾರ ಬಾಟ್:📄**\n- **ಉದ್ದೇಶ:** ಕಾನೂನು ಮಾಹಿತಿ ಮತ್ತು ಸಹಾಯ ನೀಡಲು ಸಂವಾದಾತ್ಮಕ ಚಾಟ್‌ಬಾಟ್ ಅನ್ನು ಅಭಿವೃದ್ಧಿಪಡಿಸಲಾಗಿದೆ.\n- **ವೈಶಿಷ್ಟ್ಯಗಳು:**📜\n  - ಬಳಕೆದಾರರಿಗೆ ಕಾನೂನು ಪ್ರಶ್ನೆಯನ್ನು ಕೇಳಲು ಅವಕಾಶ ನೀಡುತ್ತದೆ.\n  - ಬಳಕೆದಾರರ ಪ್ರಶ್ನೆಗೆ ಉತ್ತರವನ್ನು ನೀಡುತ್ತದೆ. ✔\n  - ಕಾನೂನು ಪ್ರಶ್ನೆಗಳನ್ನು ಕೇಳಲು ಬಳಕೆದಾರ-ಹಿತಕರ ಇಂಟರ್‌ಫೇಸ್ ಅನ್ನು ಒದಗಿಸುತ್ತದೆ."
-},
-    "Malayalam - മലയാളം": {
-    "ask_query": "നിങ്ങളുടെ നിയമ സഹായത്തിനായുള്ള ചോദ്യം ചോദിക്കുക",
-    "thinking": "ചിന്തിക്കുന്നു ✨...",
-    "no_response": "ക്ഷമിക്കണം, നിങ്ങളുടെ ചോദ്യത്തിന് അനുയോജമായ പ്രതികരണം കണ്ടെത്താനായില്ല.",
-    "positive_feedback": "👍 സാന്ദര്യപരമായ പ്രതികരണം",
-    "negative_feedback": "👎 പ്രതികൂല പ്രതികരണം",
-    "login_button": "ലോഗിൻ",
-    "welcome": "സ്വാഗതം",
-    "faq_button": "FAQ കാണിക്കുക",
-    "download_button": "ചാറ്റ് ചരിത്രം PDF ആയി ഡൗൺലോഡ് ചെയ്യുക",
-    "interaction_history": "ഇന്ററാക്ഷൻ ചരിത്രം കാണിക്കുക",
-    "voice_query": "ശബ്ദ ചോദ്യം 🎙️",
-    "view_history": "ചരിത്രം കാണുക 📜",
-    "download_law": "നിയമം ഡൗൺലോഡ് ചെയ്യുക 📁",
-    "info_section": "**നിയമ ഉപദേഷ്ടാവ് ബോട്ട്:📄**\n- **ലക്ഷ്യം:** നിയമ വിവരങ്ങളും സഹായവും നൽകാൻ സംഭാഷണ ചാറ്റ്‌ബോട്ട് വികസിപ്പിച്ചിരിക്കുന്നു.\n- **സവിശേഷതകൾ:**📜\n  - ഉപയോക്താക്കളെ നിയമ ചോദ്യങ്ങൾ ചോദിക്കാൻ അനുവദിക്കുന്നു.\n  - ഉപയോക്തൃ ചോദ്യത്തിന് പ്രതികരണം നൽകുന്നു. ✔\n  - നിയമ ചോദ്യങ്ങൾ ചോദിക്കാൻ ഉപയോക്തൃ സൗഹൃദ ഇന്റർഫേസ് നൽകുന്നു."
-}
-}
-# Streamlit Title
-st.title("LEGAL LAWS ASSISTANCE 🎗️")
-
-# Load and display the info section
-lang = translations.get(st.session_state.language_preference, translations["English"]) 
-st.info(lang.get("info_section", ""))
-st.warning("This app provides general legal information, not legal advice. Consult a qualified lawyer for advice.")
-
-# Language selection from the sidebar
-st.sidebar.title("FEATURES")
-language_preference = st.sidebar.selectbox(
-    "Welcome Select your preferred language :",
-    ["English", "Hindi - हिन्दी", "Telugu - తెలుగు", "Tamil - தமிழ்", "Malayalam - മലയാളം", "Kannada - ಕನ್ನಡ"],
-    index=["English", "Hindi - हिन्दी", "Telugu - తెలుగు", "Tamil - தமிழ்", "Malayalam - മലയാളം", "Kannada - ಕನ್ನಡ"].index(st.session_state.language_preference)
-)
-
-# Voice toggle and LLM status
-st.session_state.use_llm = True
-st.sidebar.checkbox(
-    "Enable Voice (TTS)",
-    value=st.session_state.use_voice,
-    key="use_voice"
-)
-
-def _ollama_ready() -> bool:
-    try:
-        host = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
-        r = requests.get(f"{host}/api/tags", timeout=2)
-        return r.status_code == 200
-    except Exception:
-        return False
+            _delivery_status(message_ids)
+
+
+def _delivery_status(message_ids, render=True) -> bool:
+    """Show the outbox status of ``message_ids``; True while any is still queued or sending."""
+    from email_outbox import get_outbox
+    pending = False
+    for message_id in message_ids:
+        delivery = get_outbox().status(message_id)
+        if delivery is None:
+            continue
+        pending = pending or delivery["status"] not in ("sent", "failed")
+        if not render:
+            continue
+        if delivery["status"] == "sent":
+            st.success(f"✅ Document sent to {delivery['to_email']} successfully!")
+        elif delivery["status"] == "failed":
+            st.error(f"❌ Failed to send the document to {delivery['to_email']}. Please try again.")
+        elif delivery["attempts"]:
+            st.info(f"📨 Retrying delivery to {delivery['to_email']} (attempt {delivery['attempts'] + 1})...")
+        else:
+            st.info(f"📨 Sending the document to {delivery['to_email']}...")
+    return pending
+
+# Refreshes delivery status while messages are in the outbox, then reruns the page once they have all settled
+@st.fragment(run_every=2.0)
+def delivery_status_live(message_ids):
+    if not _delivery_status(message_ids):
+        st.rerun(scope="app")
+
+# Sidebar for template selection (rendered inside ``with st.sidebar``)
+@st.fragment
+def templates_panel():
+    with profile.section("templates"):
+        # Language selection dropdown for templates with placeholder
+        template_selection = st.selectbox(
+            "Select a legal template to download :",  # Title for the dropdown
+            ["Select a template"] + list(legal_templates.keys())  # Add a placeholder option
+        )
+        # Get the selected template's file name
+        if template_selection != "Select a template":  # Ensure a valid selection is made
+            selected_template_file = legal_templates.get(template_selection)
+            # Check if the selected template file exists and provide the download button
+            if selected_template_file:
+                # Served from the shared registry cache; the file is only re-read when it changes
+                template_data = get_registry(TEMPLATES_FOLDER).data(selected_template_file)
+                if template_data is not None:  # Check if the file exists
+                    st.download_button(
+                        label=f"📄 Download {template_selection}",
+                        data=template_data,
+                        file_name=selected_template_file,
+                        mime="application/pdf"
+                    )
+                else:
+                    st.warning(f"Template '{template_selection}' is not available.")
 
-if _ollama_ready():
-    st.sidebar.success("LLM: Ready")
-else:
-    st.sidebar.warning("LLM: Not ready")
+# Sidebar section with a button to show external legal resource links
+@st.fragment
+def resources_panel():
+    with profile.section("resources"):
+        st.markdown("<br>", unsafe_allow_html=True)
+        # Small text above the button with inline style for font size and minimal margin
+        st.markdown('<p style="font-size: 14px; color: white; margin-bottom: 3.8px;">Click to view external legal resources :</p>', unsafe_allow_html=True)
+        # Button to display external legal resources
+        if st.button("External Legal Resources 🌐"):
+            # External Legal Resource Links shown upon button click
+            st.markdown("[**🔗 Indian Judiciary**](https://www.india.gov.in/topics/law-justice/)")
+            st.markdown("[**🔗 Ministry of Law & Justice**](https://legislative.gov.in/)")
+            st.markdown("[**🔗 Supreme Court of India**](https://main.sci.gov.in/)")
+        # Adding space after the content to separate from other sidebar features
+        st.markdown("<br><br>", unsafe_allow_html=True)
+
+with profile.section("header"):
+    # Streamlit Title
+    st.title("LEGAL LAWS ASSISTANCE 🎗️")
+
+    # Load and display the info section
+    lang = translations.get(st.session_state.language_preference, translations["English"])
+    st.info(lang.get("info_section", ""))
+    st.warning("This app provides general legal information, not legal advice. Consult a qualified lawyer for advice.")
+
+with profile.section("sidebar"):
+    # Language selection from the sidebar
+    st.sidebar.title("FEATURES")
+    language_preference = st.sidebar.selectbox(
+        "Welcome Select your preferred language :",
+        LANGUAGES,
+        index=LANGUAGES.index(st.session_state.language_preference)
+    )
+
+    # Voice toggle and LLM status
+    st.session_state.use_llm = True
+    st.sidebar.checkbox(
+        "Enable Voice (TTS)",
+        value=st.session_state.use_voice,
+        key="use_voice"
+    )
+
+    # Health is polled by one shared background monitor per host, never during a rerun
+    _host_status = [status for _, _, status, _ in router.get_router().status()]
+    _hosts_up = sum(status in ("ready", "warming") for status in _host_status)
+    _hosts_note = f" ({_hosts_up}/{len(_host_status)} hosts)" if len(_host_status) > 1 else ""
+    if "ready" in _host_status:
+        st.sidebar.success(f"LLM: Ready{_hosts_note}")
+    elif "warming" in _host_status:
+        st.sidebar.info(f"LLM: Loading model{_hosts_note}")
+    elif "checking" in _host_status:
+        st.sidebar.info("LLM: Checking")
+    else:
+        st.sidebar.warning("LLM: Not ready")
+    _queue = scheduler.get_scheduler().metrics()
+    st.sidebar.caption(f"LLM queue: {_queue['queue_depth']} waiting · {_queue['in_flight']} running · p95 wait {_queue['wait_p95']:.1f}s")
+    if assistant.cache_enabled():
+        _cache_stats = answer_cache.get_cache().stats()
+        st.sidebar.caption(f"Answer cache: {_cache_stats['hits']} hits · {_cache_stats['miss']} misses · {_cache_stats['entries']} stored")
 
 # Save selected language preference in session state
 if language_preference != st.session_state.language_preference:
@@ -274,6 +433,7 @@ if not st.session_state.user_logged_in:
         entered = st.text_input("Enter access passcode to continue", type="password")
         if entered and entered == admin_pass:
             st.session_state.user_logged_in = True
+            st.session_state.is_admin = True
             st.rerun()
         elif entered and entered != admin_pass:
             st.error("Incorrect passcode")
@@ -284,187 +444,78 @@ if not st.session_state.user_logged_in:
             st.session_state.user_logged_in = True
             st.rerun()
 else:
+    # Issue the history key on a full run, before any fragment reads it
+    _history_key()
     # Once logged in, show the legal assistant functionalities
-    st.write(f"👋 Hello {st.session_state.username}! {translations[st.session_state.language_preference]['ask_query']}")
-    prompt = st.chat_input(translations[st.session_state.language_preference]["ask_query"])
+    chat_panel()
 
-    if prompt:
-        st.write(f"👤 Your Query: {prompt}")
-        response = get_response(prompt)
-        st.write(f"🤖 Response: {response}")
-
-        new_log = {"user_query": prompt, "assistant_response": response}
-        st.session_state.interaction_log = pd.concat(
-            [st.session_state.interaction_log, pd.DataFrame([new_log])], ignore_index=True
-        )
-        
 # VOICE QUERY HISTORY DOWNLOAD LAW BUTTONS
 
 # Create 4 columns for the buttons
 col1, col2, col3, col4 = st.columns(4)
-
-# Speech to Text Button
 with col1:
-    if st.button(translations[st.session_state.language_preference]["voice_query"]):
-        if not st.session_state.use_voice:
-            st.info("Voice is disabled. Enable it in the sidebar.")
-        else:
-            query = listen()
-            if query:
-                st.session_state.messages.append(query)
-                st.write(f"Your Query: {query}")
-                response = get_response(query)
-                st.write(f"Assistant Response: {response}")
-                # Speak only if voice enabled
-                if st.session_state.use_voice:
-                    speak(response)
-
-                new_log = {"user_query": query, "assistant_response": response}
-                st.session_state.interaction_log = pd.concat(
-                    [st.session_state.interaction_log, pd.DataFrame([new_log])], ignore_index=True
-                )
-
-# Interaction History Button
+    voice_panel()
 with col2:
-    if st.button(translations[st.session_state.language_preference]["view_history"]):
-        st.dataframe(st.session_state.interaction_log)
-
-# PDF generator is imported from pdf_export.py
-
-# Download Button for PDF
+    history_panel()
 with col3:
-    if st.button(translations[st.session_state.language_preference]["download_law"]):
-        pdf_path = generate_pdf_from_log(st.session_state.interaction_log)
-        with open(pdf_path, "rb") as f:
-            st.download_button(
-                label="📄 Download Chat as PDF",
-                data=f.read(),
-                file_name="Chat_History.pdf",
-                mime="application/pdf",
-            )
-
-# Clear history / Export CSV
+    pdf_panel()
 with col4:
-    if st.button("Clear History"):
-        st.session_state.interaction_log = pd.DataFrame(columns=["user_query", "assistant_response"])
-        st.success("History cleared")
-    st.download_button(
-        label="⬇️ Export CSV",
-        data=st.session_state.interaction_log.to_csv(index=False).encode('utf-8'),
-        file_name="interaction_history.csv",
-        mime="text/csv"
-    )
+    export_panel()
+if st.session_state.get("show_history"):
+    history_browser()
 
 
 if __name__ == '__main__':
     # Disable auto TTS greeting to avoid pyttsx3 run-loop conflicts
     pass
-    
 
- #  GMAIL SERVICES ##
- # Path to the templates folder
-TEMPLATES_FOLDER = "templates"
 
+ #  GMAIL SERVICES ##
 # Sidebar Navigation
 st.sidebar.title(" ")
 menu_selection = st.sidebar.selectbox("Select a Service:", ["Select", "Gmail Services"])
 
 if menu_selection == "Gmail Services":
-    st.subheader("📧 Send Legal Documents via Email")
-    user_email = st.text_input("Enter your email:")
-    documents = [f for f in os.listdir(TEMPLATES_FOLDER) if f.endswith('.pdf')]
-    selected_document = st.selectbox("Choose a document:", documents)
-
-    if st.button("Send Document"):
-        if not os.environ.get("SMTP_USERNAME") or not os.environ.get("SMTP_PASSWORD"):
-            st.error("Email not configured. Set SMTP_USERNAME and SMTP_PASSWORD.")
-        elif user_email and selected_document:
-            document_path = os.path.join(TEMPLATES_FOLDER, selected_document)
-            success = send_email(user_email, "Your Legal Document", "Please find the attached legal document.", document_path)
-            if success:
-                st.success(f"✅ Document sent to {user_email} successfully!")
-            else:
-                st.error("❌ Failed to send the document. Please try again.")
-        else:
-            st.warning("⚠️ Please enter an email and select a document.")           
-# Sidebar for template selection            
-# Folder where templates are stored
-TEMPLATES_FOLDER = "templates"
-# Legal templates with file names
-legal_templates = {
-    "Rental Agreement": "rental_agreement_template.pdf",
-    "Loan Agreement":"loan-agreement-template.pdf",
-    "Employment Agreement": "employment_agreement_template.pdf",
-    "Business Agreement": "partnership_agreement_template.pdf",
-    "Freelancer Agreement": "freelancer_contract_template.pdf",
-    "Invoice Agreement": "invoice_template.pdf",
-    "Lease Agreement": "lease_agreement_template.pdf",
-    "Service Agreement": "service_agreement_template.pdf",
-    "Non-Disclosure Agreement": "nda_template.pdf"  
-}
-# Sidebar 
+    gmail_panel()
+
+# Sidebar
 st.sidebar.title("")
-with st.sidebar:   
-    # Language selection dropdown for templates with placeholder
-    template_selection = st.selectbox(
-        "Select a legal template to download :",  # Title for the dropdown
-        ["Select a template"] + list(legal_templates.keys())  # Add a placeholder option
-    )
-# Get the selected template's file name
-if template_selection != "Select a template":  # Ensure a valid selection is made
-    selected_template_file = legal_templates.get(template_selection)
-    # Check if the selected template file exists and provide the download button
-    if selected_template_file:
-        file_path = os.path.join(TEMPLATES_FOLDER, selected_template_file)     
-        if os.path.exists(file_path):  # Check if the file exists
-            with open(file_path, "rb") as file:
-                st.sidebar.download_button(
-                    label=f"📄 Download {template_selection}",
-                    data=file.read(),
-                    file_name=selected_template_file,
-                    mime="application/pdf"
-                )
-        else:
-            st.sidebar.warning(f"Template '{template_selection}' is not available.")
-            
- 
-            
-# Sidebar section with a button to show external legal resource links
-# Custom CSS to style the button
-st.markdown(
-    """
-    <style>
-    /* Style the button to be black and full-width */
-    .stButton>button {
-        background-color: #0d0d0d !important; /* Black background */
-        border: 5px solid light-grey !important;   /* White border */
-        color: white !important;              /* White text */
-        width: 100% !important;               /* Full width */
-        height: 40px !important;              /* Fixed height */
-        border-radius: 10px !important;        /* Rounded corners */
-        cursor: pointer;                     /* Pointer cursor on hover */
-        font-size: 16px !important;           /* Font size */
-    }
-    .stButton>button:hover {
-        background-color: white !important;  /* White background on hover */
-        color: #4CAF50 !important;            /* Green text on hover */
-    }
-    </style>
-""", unsafe_allow_html=True)
+with st.sidebar:
+    templates_panel()
 
-# Sidebar section with a button to show external legal resource links
+# Custom CSS to style the button
+st.markdown(BUTTON_CSS, unsafe_allow_html=True)
 
 with st.sidebar:
-    st.markdown("<br>", unsafe_allow_html=True)
-    # Small text above the button with inline style for font size and minimal margin
-    st.markdown('<p style="font-size: 14px; color: white; margin-bottom: 3.8px;">Click to view external legal resources :</p>', unsafe_allow_html=True) 
-    # Button to display external legal resources
-    if st.button("External Legal Resources 🌐"):
-        # External Legal Resource Links shown upon button click
-        st.markdown("[**🔗 Indian Judiciary**](https://www.india.gov.in/topics/law-justice/)")
-        st.markdown("[**🔗 Ministry of Law & Justice**](https://legislative.gov.in/)")
-        st.markdown("[**🔗 Supreme Court of India**](https://main.sci.gov.in/)")     
-    # Adding space after the content to separate from other sidebar features
-    st.markdown("<br><br>", unsafe_allow_html=True)
-    
-    
\ No newline at end of file
+    resources_panel()
+
+# Admin view of the pipeline latency histograms (also at METRICS_PORT/metrics when set)
+metrics.serve()
+if st.session_state.get("is_admin") or os.environ.get("METRICS_SIDEBAR", "0") != "0":
+    _metrics = metrics.snapshot()
+    with st.sidebar.expander("📈 Pipeline metrics"):
+        _counters = _metrics["counters"]
+        st.caption(
+            f"{_counters.get('requests', 0)} requests · {_counters.get('source_faq', 0)} FAQ · "
+            f"{_counters.get('source_cache', 0)} cached · {_counters.get('source_model', 0)} model · "
+            f"{_counters.get('errors', 0)} errors · {_counters.get('model_load_stalls', 0)} model-load stalls"
+        )
+        st.caption(
+            f"Model tiers: {_counters.get('tier_fast', 0)} fast · {_counters.get('tier_strong', 0)} strong · "
+            f"{_counters.get('escalations', 0)} escalated"
+        )
+        st.dataframe(
+            [
+                {"stage": stage, "count": h["count"], "p50": h["p50"], "p95": h["p95"], "max": h["max"]}
+                for stage in (*metrics.STAGES, "tokens_per_second")
+                if (h := _metrics["histograms"].get(stage))
+            ],
+            hide_index=True,
+        )
+        st.caption("Seconds per stage, except tokens_per_second.")
+
+# Rerun profiler: per-section cost of this run and typical cost across recent reruns
+if rerun_profiler.enabled():
+    profile.record("full rerun", profile.elapsed())
+    with st.sidebar.expander(f"⏱️ Rerun profile ({profile.elapsed() * 1000:.1f} ms)"):
+        st.dataframe(rerun_profiler.summary(), hide_index=True)
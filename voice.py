@@ -1,56 +1,187 @@
+import os
+import queue
+import re
 import threading
+from collections import deque
 import streamlit as st
-import pyttsx3
-import speech_recognition as sr
 
-# Robust TTS engine initialization
-try:
-    engine = pyttsx3.init()
-except Exception as e:
-    engine = None
-    st.warning("Text-to-speech is unavailable on this system.")
+# pyttsx3 and speech_recognition are imported on first use, not at app start-up;
+# the engine is created once per process and shared by every session
+engine = None
+_engine_ready = False
+_engine_init_lock = threading.Lock()
 
 engine_lock = threading.Lock()
 
-def speak(text: str) -> None:
-    if engine:
-        def _speak():
+# One long-lived speech worker fed sentence by sentence through a bounded queue
+SENTENCE_END = re.compile(r"(?<=[.!?।])\s+")
+_speech_queue = queue.Queue(maxsize=int(os.environ.get("TTS_QUEUE_SIZE", "32")))
+_speech_epoch = 0
+# Sentences waiting for room in the queue, oldest first; never blocks the LLM stream feeding them
+_backlog = deque()
+_backlog_lock = threading.Lock()
+_worker = None
+_worker_lock = threading.Lock()
+
+def get_engine():
+    """Create the TTS engine on first call; None when TTS is unavailable."""
+    global engine, _engine_ready
+    with _engine_init_lock:
+        if not _engine_ready:
+            # Robust TTS engine initialization
+            try:
+                import pyttsx3
+                engine = pyttsx3.init()
+            except Exception:
+                engine = None
+            _engine_ready = True
+    return engine
+
+def _drain_backlog() -> None:
+    """Move backlogged sentences into the speech queue while it has room."""
+    with _backlog_lock:
+        while _backlog:
+            try:
+                _speech_queue.put_nowait(_backlog[0])
+            except queue.Full:
+                return
+            _backlog.popleft()
+
+def _speech_worker() -> None:
+    while True:
+        epoch, sentence = _speech_queue.get()
+        _drain_backlog()
+        # Sentences queued before the last stop_speech() are dropped
+        if epoch == _speech_epoch and engine:
             with engine_lock:
-                engine.say(text)
+                engine.say(sentence)
                 engine.runAndWait()
-        threading.Thread(target=_speak).start()
-    else:
-        st.info("TTS engine not available.")
+
+def _enqueue(sentence: str) -> None:
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_speech_worker, name="tts-worker", daemon=True)
+            _worker.start()
+    # Called from the token callback inside a scheduler slot, so it must not wait
+    # for speech; sentences beyond the queue's room are kept in order in the backlog
+    with _backlog_lock:
+        _backlog.append((_speech_epoch, sentence))
+    _drain_backlog()
+
+class SentenceStream:
+    """Speak a growing answer one complete sentence at a time.
+
+    Call :meth:`feed` with the text generated so far (as streamed by the LLM)
+    and :meth:`finish` with the final answer to speak whatever is left.
+    """
+
+    def __init__(self):
+        self.spoken = 0
+        self.available = get_engine() is not None
+
+    def feed(self, text: str) -> None:
+        if not self.available:
+            return
+        parts = SENTENCE_END.split(text[self.spoken:])
+        for sentence in parts[:-1]:
+            if sentence.strip():
+                _enqueue(sentence.strip())
+        self.spoken = len(text) - len(parts[-1])
+
+    def finish(self, text: str) -> None:
+        if not self.available:
+            st.info("TTS engine not available.")
+            return
+        self.feed(text)
+        rest = text[self.spoken:].strip()
+        if rest:
+            _enqueue(rest)
+        self.spoken = len(text)
+
+def speak(text: str) -> None:
+    SentenceStream().finish(text)
 
 def stop_speech() -> None:
+    """Cancel queued sentences and stop the one being spoken."""
+    global _speech_epoch
+    _speech_epoch += 1
+    with _backlog_lock:
+        _backlog.clear()
+    while True:
+        try:
+            _speech_queue.get_nowait()
+        except queue.Empty:
+            break
     if engine:
-        with engine_lock:
-            engine.stop()
+        engine.stop()
+
+# One recognizer per process: ambient-noise calibration runs on first use only,
+# after which its dynamic energy threshold keeps adapting
+_recognizer = None
+_recognizer_lock = threading.Lock()
+
+def _get_recognizer(source):
+    global _recognizer
+    import speech_recognition as sr
+    with _recognizer_lock:
+        if _recognizer is None:
+            recognizer = sr.Recognizer()
+            recognizer.adjust_for_ambient_noise(source, duration=0.5)
+            _recognizer = recognizer
+    return _recognizer
+
+def _offline_enabled() -> bool:
+    return os.environ.get("VOICE_ENGINE", "google") == "offline"
+
+def _listen_offline(on_partial=None) -> str | None:
+    """Transcribe with the offline engine; None when Vosk or its model is missing."""
+    from speech_offline import OfflineASRUnavailable, OfflineRecognizer, microphone_frames
+    try:
+        return OfflineRecognizer().transcribe(microphone_frames(), on_partial=on_partial)
+    except OfflineASRUnavailable:
+        return None
 
 def listen_for_stop() -> None:
-    recognizer = sr.Recognizer()
-    with sr.Microphone() as source:
-        recognizer.adjust_for_ambient_noise(source)
-        try:
-            audio = recognizer.listen(source, timeout=5)
-            command = recognizer.recognize_google(audio).lower()
-            if "stop" in command and engine:
-                stop_speech()
-        except Exception:
-            pass
+    try:
+        command = _listen_offline() if _offline_enabled() else None
+        if command is None:
+            import speech_recognition as sr
+            with sr.Microphone() as source:
+                recognizer = _get_recognizer(source)
+                audio = recognizer.listen(source, timeout=5)
+            command = recognizer.recognize_google(audio)
+        if "stop" in command.lower() and engine:
+            stop_speech()
+    except Exception:
+        pass
 
 def listen() -> str:
-    recognizer = sr.Recognizer()
-    with sr.Microphone() as source:
-        st.write("Listening...")
-        recognizer.adjust_for_ambient_noise(source)
-        audio = recognizer.listen(source)
+    st.write("Listening...")
+    if _offline_enabled():
+        # Offline engine: partial transcripts while speaking, returns as soon as speech ends
+        partial = st.empty()
         try:
-            query = recognizer.recognize_google(audio)
-            st.write(f"Voice Input: {query}")
-            return query
-        except Exception:
-            st.error("Voice input unavailable.")
+            query = _listen_offline(on_partial=lambda text: partial.write(f"🎙️ {text}"))
+        except Exception as e:
+            st.error(f"Voice input unavailable: {e}")
             return ""
+        partial.empty()
+        if query is not None:
+            if query:
+                st.write(f"Voice Input: {query}")
+            return query
+
+    import speech_recognition as sr
+    with sr.Microphone() as source:
+        recognizer = _get_recognizer(source)
+        audio = recognizer.listen(source)
+    try:
+        query = recognizer.recognize_google(audio)
+        st.write(f"Voice Input: {query}")
+        return query
+    except Exception:
+        st.error("Voice input unavailable.")
+        return ""
 
 